@@ -0,0 +1,434 @@
+"""Benchmark the extraction pipeline on synthetic financial documents.
+
+Documents are synthesized from the rows of ``Financial Statements.csv`` with
+the natural-language templates used for training data, at controlled sizes,
+plus multi-page PDFs and large CSV/XLSX tables. Each stage is timed
+separately and the results are written as JSON:
+
+    {"cases": {"<stage>/<size>": {"min_s", "p50_s", "p95_s", "mb_per_s", "peak_rss_mb",
+                                  "peak_children_rss_mb", ...}}}
+
+``peak_rss_mb`` is this process; ``peak_children_rss_mb`` sums its child
+processes (the PDF page pool) and is only available on Linux.
+
+Compare against a saved baseline to catch regressions:
+
+    python benchmarks/bench_extraction.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_extraction.py --baseline benchmarks/baseline.json
+
+Fast cases are repeated for at least half a second. Comparisons use each
+case's fastest run; cases timed fewer than three times (the largest texts)
+are reported but not compared. The exit status is 1 when any compared case
+is slower than the baseline by more than ``--tolerance``, and 2 when the baseline was run with a different
+configuration (chunking, pre-filter, PDF pool size).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+from training_data import (  # noqa: E402
+    DATASET_PATH, NATURAL_TEMPLATES, compile_template, fill_template, iter_dataset, iter_rows,
+)
+
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2}
+# Fast cases run until this much time has passed, up to MAX_REPEAT times
+MIN_MEASURE_SECONDS = 0.5
+MAX_REPEAT = 100
+# Cases timed fewer times are too noisy to compare against a baseline
+MIN_COMPARED_REPEAT = 3
+DEFAULT_TEXT_SIZES = '1KB,100KB,1MB,10MB,50MB'
+QUICK_TEXT_SIZES = '1KB,100KB'
+BOILERPLATE = [
+    "The board reviewed the report and approved the accounts.",
+    "Forward-looking statements involve risks and uncertainties.",
+    "This section describes our governance practices.",
+]
+
+
+def parse_size(size):
+    size = size.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if size.endswith(unit):
+            return int(float(size[:-len(unit)]) * factor)
+    return int(size)
+
+
+def load_rows():
+    return list(iter_rows(iter_dataset(os.path.join(ROOT_DIR, DATASET_PATH))))
+
+
+def iter_sentences(rows, rng, boilerplate_ratio=0.3):
+    """Endless stream of template sentences, mixed with boilerplate lines."""
+    compiled = [compile_template(template) for template in NATURAL_TEMPLATES]
+    while True:
+        if rng.random() < boilerplate_ratio:
+            yield rng.choice(BOILERPLATE)
+            continue
+        filled = fill_template(rng.choice(compiled), rng.choice(rows))
+        if filled is not None:
+            yield filled[0]
+
+
+def synthesize_text(rows, size, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    for sentence in iter_sentences(rows, rng):
+        if total >= size:
+            break
+        lines.append(sentence)
+        total += len(sentence) + 1
+    return '\n'.join(lines)[:size]
+
+
+def write_pdf(path, pages):
+    """Write a minimal text-only PDF with one page per list of lines."""
+    objects = [b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>', None]
+    pages_ref = 2
+    kids = []
+    for lines in pages:
+        ops = ['BT /F1 9 Tf 11 TL 36 806 Td']
+        for line in lines:
+            line = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            ops.append(f'({line}) Tj T*')
+        ops.append('ET')
+        content = '\n'.join(ops).encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        objects.append(f'<< /Type /Page /Parent {pages_ref} 0 R /MediaBox [0 0 595 842] '
+                       f'/Contents {len(objects)} 0 R /Resources << /Font << /F1 1 0 R >> >> >>'.encode())
+        kids.append(len(objects))
+    objects[pages_ref - 1] = (f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] "
+                              f"/Count {len(kids)} >>").encode()
+    objects.append(f'<< /Type /Catalog /Pages {pages_ref} 0 R >>'.encode())
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n'.encode() + body + b'\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += (f'trailer\n<< /Size {len(objects) + 1} /Root {len(objects)} 0 R >>\n'
+            f'startxref\n{xref}\n%%EOF\n').encode()
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def synthesize_pdf(path, rows, page_count, lines_per_page=60, seed=0):
+    sentences = iter_sentences(rows, random.Random(seed))
+    write_pdf(path, [[next(sentences) for _ in range(lines_per_page)] for _ in range(page_count)])
+
+
+def synthesize_table(rows_count, seed=0):
+    df = pd.read_csv(os.path.join(ROOT_DIR, DATASET_PATH), encoding='utf-8-sig')
+    repeats = -(-rows_count // len(df))
+    table = pd.concat([df] * repeats, ignore_index=True).iloc[:rows_count]
+    return table.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+class RssSampler:
+    """Track the peak resident set size of this process, and of its child
+    processes together, while a stage runs."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self.children_peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _rss(pid='self'):
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    @classmethod
+    def current_rss(cls):
+        try:
+            return cls._rss()
+        except (OSError, ValueError):
+            import resource
+            # ru_maxrss is the lifetime peak, in KiB on Linux and bytes on macOS
+            scale = 1 if platform.system() == 'Darwin' else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    @classmethod
+    def children_rss(cls):
+        """Summed RSS of all descendant processes, or None without /proc."""
+        children = {}
+        try:
+            names = os.listdir('/proc')
+        except OSError:
+            return None
+        for name in names:
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat') as f:
+                    # The command name may contain spaces; the parent pid follows the state after it
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+            children.setdefault(ppid, []).append(name)
+        total = 0
+        stack = list(children.get(os.getpid(), []))
+        while stack:
+            pid = stack.pop()
+            try:
+                total += cls._rss(pid)
+            except (OSError, ValueError):
+                continue
+            stack.extend(children.get(int(pid), []))
+        return total
+
+    def _sample(self):
+        self.peak = max(self.peak, self.current_rss())
+        children = self.children_rss()
+        if children is not None:
+            self.children_peak = max(self.children_peak or 0, children)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.peak = self.current_rss()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(func, repeat, input_bytes):
+    """Time ``func`` ``repeat`` times, and more while the total is under MIN_MEASURE_SECONDS."""
+    timings = []
+    with RssSampler() as sampler:
+        while len(timings) < repeat or (sum(timings) < MIN_MEASURE_SECONDS and len(timings) < MAX_REPEAT):
+            began = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - began)
+    p50 = statistics.median(timings)
+    return {
+        'repeat': len(timings),
+        'input_bytes': input_bytes,
+        'min_s': min(timings),
+        'p50_s': p50,
+        'p95_s': percentile(timings, 95),
+        'mb_per_s': input_bytes / p50 / SIZE_UNITS['MB'] if p50 else None,
+        'peak_rss_mb': sampler.peak / SIZE_UNITS['MB'],
+        'peak_children_rss_mb': (sampler.children_peak / SIZE_UNITS['MB']
+                                 if sampler.children_peak is not None else None),
+    }
+
+
+def make_render_app():
+    """A bare Flask app with the results template and stub routes for url_for."""
+    from flask import Flask
+
+    render_app = Flask('bench', template_folder=os.path.join(ROOT_DIR, 'src', 'templates'))
+    for endpoint, rule in (('show_result', '/results/<result_id>'),
+                           ('result_raw', '/results/<result_id>/raw'),
+                           ('export_result_csv', '/results/<result_id>/export.csv'),
+                           ('export_result_jsonl', '/results/<result_id>/export.jsonl')):
+        render_app.add_url_rule(rule, endpoint, lambda result_id: '')
+    return render_app
+
+
+def run(args):
+    from flask import render_template
+
+    from extraction import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_CHARS, extract_grouped
+    from model_manager import load_pipeline
+    from prefilter import SentencePrefilter, load_gazetteer
+    from tabular import extract_grouped_from_table
+    from text_extraction import extract_text_from_csv, extract_text_from_pdf, extract_text_from_xls
+
+    # Everything that changes the work done is pinned here and stored in the report
+    config = {
+        'chunk_chars': DEFAULT_CHUNK_CHARS,
+        'batch_size': DEFAULT_BATCH_SIZE,
+        'n_process': 1,
+        'prefilter': args.prefilter,
+        'pdf_n_process': args.pdf_n_process,
+        'results_per_page': 100,
+        'raw_preview_chars': 20_000,
+    }
+    cases = {}
+
+    def record(name, func, repeat, input_bytes):
+        result = measure(func, repeat, input_bytes)
+        cases[name] = result
+        print(f"{name:<48} p50 {result['p50_s']:.4f}s  p95 {result['p95_s']:.4f}s  "
+              f"{result['mb_per_s'] or 0:.3f} MB/s  rss {result['peak_rss_mb']:.0f} MB  "
+              f"children {result['peak_children_rss_mb'] or 0:.0f} MB  x{result['repeat']}", file=sys.stderr)
+
+    rows = load_rows()
+    began = time.perf_counter()
+    nlp, version = load_pipeline(args.model)
+    cases['model_load'] = {'seconds': time.perf_counter() - began}
+    companies = load_gazetteer(os.path.join(ROOT_DIR, DATASET_PATH))
+    render_app = make_render_app()
+
+    def extract(text, prefilter):
+        return extract_grouped(nlp, text, chunk_chars=config['chunk_chars'], batch_size=config['batch_size'],
+                               n_process=config['n_process'], prefilter=prefilter)
+
+    for label in args.sizes.split(','):
+        size = parse_size(label)
+        text = synthesize_text(rows, size, seed=args.seed)
+        repeat = args.repeat if size <= SIZE_UNITS['MB'] else 1
+        # A fresh pre-filter per case, so its counters never carry over
+        prefilter = (SentencePrefilter(nlp, companies, nlp.meta.get('emitted_companies', []))
+                     if config['prefilter'] else None)
+        record(f'extract_grouped/{label}', lambda: extract(text, prefilter), repeat, len(text.encode('utf-8')))
+        groups = extract(text, prefilter)
+        labels = sorted({label for group in groups for label in group})
+
+        def render():
+            # One page, as the results view serves it
+            per_page = config['results_per_page']
+            with render_app.test_request_context():
+                render_template('result.html', result_id='0' * 16, groups=groups[:per_page], labels=labels,
+                                selected_labels=labels, page=1, per_page=per_page,
+                                page_count=max(1, -(-len(groups) // per_page)), total=len(groups),
+                                raw_preview=text[:config['raw_preview_chars']], raw_chars=len(text))
+        record(f'render_result/{label}', render, repeat, len(text.encode('utf-8')))
+
+    known_labels = nlp.get_pipe('ner').labels
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, page_count in enumerate(int(pages) for pages in args.pdf_pages.split(',')):
+            path = os.path.join(tmp_dir, f'report-{page_count}.pdf')
+            synthesize_pdf(path, rows, page_count, seed=args.seed)
+            if i == 0:
+                # Start the page pool outside the timings
+                extract_text_from_pdf(path, config['pdf_n_process'])
+            record(f'extract_text_from_pdf/{page_count}_pages',
+                   lambda: extract_text_from_pdf(path, config['pdf_n_process']),
+                   args.repeat, os.path.getsize(path))
+
+        for rows_count in (int(count) for count in args.table_rows.split(',')):
+            table = synthesize_table(rows_count, seed=args.seed)
+            csv_path = os.path.join(tmp_dir, f'table-{rows_count}.csv')
+            table.to_csv(csv_path, index=False)
+            record(f'extract_text_from_csv/{rows_count}_rows',
+                   lambda: extract_text_from_csv(csv_path), args.repeat, os.path.getsize(csv_path))
+            record(f'extract_grouped_from_table/{rows_count}_rows',
+                   lambda: extract_grouped_from_table(csv_path, 'csv', known_labels),
+                   args.repeat, os.path.getsize(csv_path))
+            if not args.skip_xlsx:
+                xlsx_path = os.path.join(tmp_dir, f'table-{rows_count}.xlsx')
+                table.to_excel(xlsx_path, index=False)
+                record(f'extract_text_from_xls/{rows_count}_rows',
+                       lambda: extract_text_from_xls(xlsx_path), args.repeat, os.path.getsize(xlsx_path))
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'model_version': version,
+        'config': config,
+        'cases': cases,
+    }
+
+
+def compare(report, baseline, tolerance, min_delta=0.005):
+    """Return (case, baseline time, current time) for every regressed case.
+
+    Cases are compared on their fastest run, which is far less sensitive to
+    other load on the machine than the p50. A case regresses when it is
+    more than ``tolerance`` slower and the difference exceeds ``min_delta``
+    seconds, so timer noise on tiny inputs does not fail the run. Cases
+    timed fewer than MIN_COMPARED_REPEAT times on either side are skipped:
+    one run says nothing about the spread.
+    """
+    regressions = []
+    for name, result in report['cases'].items():
+        previous = baseline.get('cases', {}).get(name)
+        if not previous or 'min_s' not in result or 'min_s' not in previous:
+            continue
+        if min(result['repeat'], previous['repeat']) < MIN_COMPARED_REPEAT:
+            continue
+        slower = result['min_s'] - previous['min_s']
+        if result['min_s'] > previous['min_s'] * (1 + tolerance) and slower > min_delta:
+            regressions.append((name, previous['min_s'], result['min_s']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the financial extraction pipeline.')
+    parser.add_argument('--model', default=os.path.join(ROOT_DIR, 'custom_financial_ner'))
+    parser.add_argument('--no-prefilter', dest='prefilter', action='store_false',
+                        help='run every sentence through NER')
+    parser.add_argument('--pdf-n-process', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--sizes', default=DEFAULT_TEXT_SIZES, help='text sizes, e.g. 1KB,10MB')
+    parser.add_argument('--pdf-pages', default='10,100')
+    parser.add_argument('--table-rows', default='10000,50000')
+    parser.add_argument('--skip-xlsx', action='store_true')
+    parser.add_argument('--quick', action='store_true', help='small sizes only, for a fast smoke run')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--save-baseline', help='also write the report to this path')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown, 0.2 = 20%%')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='ignore slowdowns below this many seconds')
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.sizes, args.pdf_pages, args.table_rows = QUICK_TEXT_SIZES, '5', '2000'
+
+    report = run(args)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print(f"Baseline config {baseline.get('config')} differs from {report['config']}; "
+                  f"rerun with matching options", file=sys.stderr)
+            return 2
+        regressions = compare(report, baseline, args.tolerance, args.min_delta)
+        report['regressions'] = [
+            {'case': name, 'baseline_min_s': before, 'min_s': after} for name, before, after in regressions
+        ]
+        for name, before, after in regressions:
+            print(f'REGRESSION {name}: min {before:.4f}s -> {after:.4f}s', file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
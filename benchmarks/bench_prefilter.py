@@ -0,0 +1,135 @@
+"""Check the sentence pre-filter against full NER on a held-out set.
+
+Held-out sentences come from the dev DocBin corpus written by
+``training_data.py`` (or, without one, are synthesized from the statement
+rows with a separate seed). They are mixed with boilerplate lines into long
+reports and extracted both with full NER and through the pre-filter:
+
+    python benchmarks/bench_prefilter.py --dev corpus/dev --boilerplate-ratio 0.8
+
+The report gives the skip rate, the throughput of both paths, and how many of
+the full-NER groups the pre-filter reproduces (recall) and how many of its
+groups full NER also finds (precision). The exit status is 1 when recall
+falls below ``--min-recall``.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from spacy.training import Corpus  # noqa: E402
+
+from bench_extraction import BOILERPLATE, iter_sentences, load_rows  # noqa: E402
+from extraction import extract_grouped  # noqa: E402
+from model_manager import load_pipeline  # noqa: E402
+from prefilter import SentencePrefilter, load_gazetteer  # noqa: E402
+from training_data import DATASET_PATH  # noqa: E402
+
+DEFAULT_MODEL_DIR = os.path.join(ROOT_DIR, 'custom_financial_ner')
+
+
+def load_heldout(nlp, dev_path, count, seed):
+    if dev_path and os.path.exists(dev_path):
+        texts = [example.reference.text for example in Corpus(dev_path)(nlp)]
+        random.Random(seed).shuffle(texts)
+        return texts[:count]
+    rng = random.Random(seed + 1)
+    sentences = iter_sentences(load_rows(), rng, boilerplate_ratio=0.0)
+    return [next(sentences) for _ in range(count)]
+
+
+def build_reports(sentences, boilerplate_ratio, report_sentences, seed):
+    """Interleave held-out sentences with boilerplate into report-sized texts."""
+    rng = random.Random(seed)
+    remaining = list(sentences)
+    reports = []
+    lines = []
+    while remaining:
+        if rng.random() < boilerplate_ratio:
+            lines.append(rng.choice(BOILERPLATE))
+        else:
+            lines.append(remaining.pop())
+        if len(lines) >= report_sentences:
+            reports.append('\n'.join(lines))
+            lines = []
+    if lines:
+        reports.append('\n'.join(lines))
+    return reports
+
+
+def group_keys(groups):
+    return {tuple(sorted(group.items())) for group in groups}
+
+
+def run(args):
+    nlp, version = load_pipeline(args.model)
+    sentences = load_heldout(nlp, args.dev, args.sentences, args.seed)
+    reports = build_reports(sentences, args.boilerplate_ratio, args.report_sentences, args.seed)
+    prefilter = SentencePrefilter(nlp, load_gazetteer(os.path.join(ROOT_DIR, DATASET_PATH)),
+                                  nlp.meta.get('emitted_companies', []))
+    # Warm both paths, as a long-running server would be
+    extract_grouped(nlp, reports[0])
+    extract_grouped(nlp, reports[0], prefilter=SentencePrefilter(nlp))
+
+    full_seconds = filtered_seconds = 0.0
+    full_keys = set()
+    filtered_keys = set()
+    for report in reports:
+        began = time.perf_counter()
+        full = extract_grouped(nlp, report)
+        full_seconds += time.perf_counter() - began
+        began = time.perf_counter()
+        filtered = extract_grouped(nlp, report, prefilter=prefilter)
+        filtered_seconds += time.perf_counter() - began
+        full_keys |= group_keys(full)
+        filtered_keys |= group_keys(filtered)
+
+    common = len(full_keys & filtered_keys)
+    megabytes = sum(len(report.encode('utf-8')) for report in reports) / 1024 ** 2
+    return {
+        'model_version': version,
+        'heldout': args.dev if args.dev and os.path.exists(args.dev) else 'synthetic',
+        'sentences': len(sentences),
+        'reports': len(reports),
+        'boilerplate_ratio': args.boilerplate_ratio,
+        'prefilter': prefilter.stats(),
+        'full_mb_per_s': round(megabytes / full_seconds, 4),
+        'prefilter_mb_per_s': round(megabytes / filtered_seconds, 4),
+        'speedup': round(full_seconds / filtered_seconds, 2),
+        'full_groups': len(full_keys),
+        'prefilter_groups': len(filtered_keys),
+        'recall': round(common / len(full_keys), 4) if full_keys else 1.0,
+        'precision': round(common / len(filtered_keys), 4) if filtered_keys else 1.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare the sentence pre-filter with full NER.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--dev', default=os.path.join(ROOT_DIR, 'corpus', 'dev'),
+                        help='held-out DocBin corpus; synthesized when missing')
+    parser.add_argument('--sentences', type=int, default=2000, help='held-out sentences to use')
+    parser.add_argument('--boilerplate-ratio', type=float, default=0.8,
+                        help='share of report lines without entities')
+    parser.add_argument('--report-sentences', type=int, default=2000, help='lines per synthesized report')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-recall', type=float, default=0.95)
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if report['recall'] < args.min_recall:
+        print(f'Pre-filter recall {report["recall"]:.4f} is below {args.min_recall}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +0,0 @@
-TRAIN_DATA = [('The ROE for NVDA in 2014 was 9.8734 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 35, 'ROE')]}), ('PCG reported a revenue of 16833.0 crore for the year 2015.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('PCG reported a revenue of 16759.0 crore for the year 2018.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for AIG in 2017 was -9.2226 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 35, 'ROE')]}), ('The ROE for INTC in 2018 was 28.2352 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for NVDA in 2021 was 25.6438 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for MCD in 2017 was -158.8832 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 37, 'ROE')]}), ('NVDA reported a revenue of 3997.93 crore for the year 2012.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('AMZN reported a revenue of 513983.0 crore for the year 2022.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for AAPL in 2017 was 36.0702 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for PYPL in 2014 was 5.08 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 33, 'ROE')]}), ('PYPL reported a revenue of 15451.0 crore for the year 2018.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('AIG reported a revenue of 52057.0 crore for the year 2021.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('MCD reported a revenue of 21257.9 crore for the year 2018.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for MSFT in 2021 was 43.1522 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('NVDA reported a revenue of 4682.0 crore for the year 2015.', {'entities': [(0, 4, 'COMPANY'), (27, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('AAPL reported a revenue of 215639.0 crore for the year 2016.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('INTC reported a revenue of 71965.0 crore for the year 2019.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for PCG in 2016 was 7.7342 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('GOOG reported a revenue of 66001.0 crore for the year 2014.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('SHLDQ reported a revenue of 16702.0 crore for the year 2018.', {'entities': [(0, 5, 'COMPANY'), (28, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('GOOG reported a revenue of 74989.0 crore for the year 2015.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for NVDA in 2009 was -1.2545 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('NVDA reported a revenue of 3326.445 crore for the year 2010.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for PYPL in 2019 was 14.5254 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('INTC reported a revenue of 53341.0 crore for the year 2012.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for AMZN in 2014 was -2.2437 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('AIG reported a revenue of 72829.0 crore for the year 2010.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for NVDA in 2013 was 11.6523 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for PCG in 2012 was 6.2284 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('PCG reported a revenue of 21680.0 crore for the year 2022.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('AIG reported a revenue of 43736.0 crore for the year 2020.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for PYPL in 2017 was 11.223 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 35, 'ROE')]}), ('MCD reported a revenue of 22820.4 crore for the year 2017.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for AIG in 2015 was 2.4631 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('AIG reported a revenue of 71214.0 crore for the year 2012.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('PCG reported a revenue of 17129.0 crore for the year 2019.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for INTC in 2015 was 18.6953 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for BCS in 2009 was 19.5283 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 35, 'ROE')]}), ('The ROE for PCG in 2014 was 9.0625 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('PCG reported a revenue of 17135.0 crore for the year 2017.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for GOOG in 2016 was 14.0093 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('INTC reported a revenue of 55355.0 crore for the year 2015.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('MSFT reported a revenue of 62484.0 crore for the year 2010.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for PCG in 2021 was -0.4146 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 35, 'ROE')]}), ('The ROE for PYPL in 2020 was 20.944 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 35, 'ROE')]}), ('The ROE for AAPL in 2011 was 33.8341 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for MCD in 2018 was -94.6616 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 36, 'ROE')]}), ('MCD reported a revenue of 27441.3 crore for the year 2014.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('INTC reported a revenue of 53999.0 crore for the year 2011.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for AMZN in 2012 was -0.4761 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for GOOG in 2010 was 18.3928 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for AIG in 2016 was -0.337 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('The ROE for AMZN in 2018 was 23.1303 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for MCD in 2012 was 35.7326 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 35, 'ROE')]}), ('The ROE for GOOG in 2018 was 17.3036 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for MCD in 2009 was 32.4286 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 35, 'ROE')]}), ('MCD reported a revenue of 21364.4 crore for the year 2019.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for BCS in 2022 was 8.624 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 33, 'ROE')]}), ('INTC reported a revenue of 79024.0 crore for the year 2021.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('AMZN reported a revenue of 34204.0 crore for the year 2010.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('BCS reported a revenue of 30169.69 crore for the year 2021.', {'entities': [(0, 3, 'COMPANY'), (26, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('MCD reported a revenue of 19207.8 crore for the year 2020.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for GOOG in 2017 was 8.3028 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 35, 'ROE')]}), ('The ROE for PCG in 2018 was -52.9877 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 36, 'ROE')]}), ('AAPL reported a revenue of 182795.0 crore for the year 2014.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for AIG in 2011 was 18.4222 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 35, 'ROE')]}), ('INTC reported a revenue of 63054.0 crore for the year 2022.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for NVDA in 2022 was 36.6451 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for GOOG in 2021 was 30.2156 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for AIG in 2009 was -45.3061 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 36, 'ROE')]}), ('MSFT reported a revenue of 77849.0 crore for the year 2013.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('The ROE for MSFT in 2017 was 29.0602 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('BCS reported a revenue of 27621.9 crore for the year 2019.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('NVDA reported a revenue of 4280.159 crore for the year 2013.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for MSFT in 2019 was 38.3465 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for MCD in 2022 was -102.8983 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 37, 'ROE')]}), ('AAPL reported a revenue of 394328.0 crore for the year 2022.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for SHLDQ in 2015 was 191.5344 percent.', {'entities': [(12, 17, 'COMPANY'), (21, 25, 'YEAR'), (30, 38, 'ROE')]}), ('AMZN reported a revenue of 386064.0 crore for the year 2020.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for NVDA in 2023 was 19.7638 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for BCS in 2020 was 3.6796 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('AIG reported a revenue of 68874.0 crore for the year 2013.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for AMZN in 2011 was 8.1346 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 35, 'ROE')]}), ('The ROE for MSFT in 2010 was 40.628 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 35, 'ROE')]}), ('MSFT reported a revenue of 73723.0 crore for the year 2012.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('GOOG reported a revenue of 23651.0 crore for the year 2009.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('BCS reported a revenue of 27162.75 crore for the year 2017.', {'entities': [(0, 3, 'COMPANY'), (26, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('AAPL reported a revenue of 42905.0 crore for the year 2009.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('MCD reported a revenue of 28105.7 crore for the year 2013.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('GOOG reported a revenue of 37905.0 crore for the year 2011.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('MSFT reported a revenue of 168088.0 crore for the year 2021.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for AAPL in 2021 was 150.0713 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 37, 'ROE')]}), ('The ROE for BCS in 2013 was 2.0282 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('PCG reported a revenue of 13399.0 crore for the year 2009.', {'entities': [(0, 3, 'COMPANY'), (26, 33, 'REVENUE'), (53, 57, 'YEAR')]}), ('The ROE for AAPL in 2010 was 29.3214 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('SHLDQ reported a revenue of 25146.0 crore for the year 2016.', {'entities': [(0, 5, 'COMPANY'), (28, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('AAPL reported a revenue of 65225.0 crore for the year 2010.', {'entities': [(0, 4, 'COMPANY'), (27, 34, 'REVENUE'), (54, 58, 'YEAR')]}), ('SHLDQ reported a revenue of 46770.0 crore for the year 2009.', {'entities': [(0, 5, 'COMPANY'), (28, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('AAPL reported a revenue of 274515.0 crore for the year 2020.', {'entities': [(0, 4, 'COMPANY'), (27, 35, 'REVENUE'), (55, 59, 'YEAR')]}), ('The ROE for NVDA in 2018 was 40.7844 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for BCS in 2014 was 1.2811 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 34, 'ROE')]}), ('The ROE for INTC in 2017 was 13.9107 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]}), ('The ROE for MCD in 2021 was -163.9903 percent.', {'entities': [(12, 15, 'COMPANY'), (19, 23, 'YEAR'), (28, 37, 'ROE')]}), ('The ROE for INTC in 2009 was 10.4762 percent.', {'entities': [(12, 16, 'COMPANY'), (20, 24, 'YEAR'), (29, 36, 'ROE')]})]
\ No newline at end of file
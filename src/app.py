@@ -1,122 +1,546 @@
 import os
-from flask import Flask, render_template, request
-import spacy
-import pdfplumber
-import pandas as pd
+import cProfile
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import pstats
+import tempfile
+import threading
+import time
+import uuid
+from flask import Flask, Response, abort, g, has_request_context, jsonify, redirect, render_template, request, url_for
 from werkzeug.utils import secure_filename
+from extraction import extract_grouped
+from tabular import TABULAR_EXTENSIONS, extract_grouped_from_table, iter_table_csv
+from text_extraction import extract_text_from_file, iter_text_from_file
+from jobs import JobManager, QueueFull, default_start_method
+from metrics import COUNT_BUCKETS, SIZE_BUCKETS, Registry, StageTimer, TimedIterator
+from model_manager import ModelManager
+from prefilter import prefilter_for
+from result_cache import ResultCache, extraction_version, file_key, text_key
+from result_store import ResultStore
 
-UPLOAD_FOLDER = 'uploads'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
+RESULTS_FOLDER = os.path.join(BASE_DIR, 'results')
+# train_spacy_ner.py promotes models to models/custom_financial_ner, which git ignores;
+# until one exists the app serves the model checked into the repo
+TRAINED_MODEL_DIR = os.path.join(BASE_DIR, '..', 'models', 'custom_financial_ner')
+MODEL_DIR = os.environ.get('FINANCIAL_NER_MODEL') or (
+    TRAINED_MODEL_DIR if os.path.exists(TRAINED_MODEL_DIR) else os.path.join(BASE_DIR, '..', 'custom_financial_ner'))
 ALLOWED_EXTENSIONS = {'pdf', 'xls', 'xlsx', 'csv', 'txt'}
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# NER engine tuning: chunk size bounds peak memory, n_process spreads chunks over cores
+app.config['NER_CHUNK_CHARS'] = int(os.environ.get('NER_CHUNK_CHARS', 100_000))
+app.config['NER_BATCH_SIZE'] = int(os.environ.get('NER_BATCH_SIZE', 4))
+app.config['NER_N_PROCESS'] = int(os.environ.get('NER_N_PROCESS', 1))
+# Extraction result cache: in-memory LRU, plus an on-disk tier when RESULT_CACHE_DIR is set
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('RESULT_CACHE_SIZE', 256))
+app.config['RESULT_CACHE_DIR'] = os.environ.get('RESULT_CACHE_DIR')
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+app.config['RESULT_CACHE_MEMORY_BYTES'] = int(os.environ.get('RESULT_CACHE_MEMORY_BYTES', 128 * 1024 * 1024))
+# Bulk API worker pool; JOB_WORKERS defaults to one less than the CPU count
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 0)) or None
+app.config['JOB_MAX_QUEUE_DEPTH'] = int(os.environ.get('JOB_MAX_QUEUE_DEPTH', 1000))
+app.config['JOB_MAX_BATCH_SIZE'] = int(os.environ.get('JOB_MAX_BATCH_SIZE', 500))
+app.config['JOB_START_METHOD'] = os.environ.get('JOB_START_METHOD') or default_start_method()
+# Sentences with no digit and no known company skip the NER model; known companies
+# come from the gazetteer and the COMPANY names the model emitted on its dev set
+app.config['NER_PREFILTER'] = os.environ.get('NER_PREFILTER', '1') != '0'
+app.config['NER_GAZETTEER'] = os.environ.get('NER_GAZETTEER', os.path.join(BASE_DIR, '..', 'Financial Statements.csv'))
+# Spreadsheets whose headers name the entities skip the model entirely
+app.config['TABULAR_FAST_PATH'] = os.environ.get('TABULAR_FAST_PATH', '1') != '0'
+# PDF pages are extracted in a process pool of this size and streamed into NER
+app.config['PDF_N_PROCESS'] = int(os.environ.get('PDF_N_PROCESS', os.cpu_count() or 1))
+# Model loading: assembled pipelines are cached per version, meta.json is polled for hot reload
+app.config['MODEL_CACHE_DIR'] = os.environ.get('MODEL_CACHE_DIR', os.path.join(BASE_DIR, 'model_cache'))
+app.config['MODEL_RELOAD_INTERVAL'] = float(os.environ.get('MODEL_RELOAD_INTERVAL', 5))
+app.config['MODEL_PRELOAD'] = os.environ.get('MODEL_PRELOAD', '1') != '0'
+# Instrumentation: slow requests are logged with their stage breakdown; profiling is
+# enabled for every request with PROFILE_REQUESTS, or per request with an X-Profile header
+app.config['SLOW_REQUEST_SECONDS'] = float(os.environ.get('SLOW_REQUEST_SECONDS', 5))
+app.config['PROFILE_REQUESTS'] = os.environ.get('PROFILE_REQUESTS', '0') == '1'
+app.config['PROFILE_ALLOW_HEADER'] = os.environ.get('PROFILE_ALLOW_HEADER', '0') == '1'
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+app.config['PROFILE_MAX_FILES'] = int(os.environ.get('PROFILE_MAX_FILES', 50))
+# Results are stored server-side and served a page at a time
+app.config['RESULTS_FOLDER'] = RESULTS_FOLDER
+app.config['RESULT_STORE_MAX_RESULTS'] = int(os.environ.get('RESULT_STORE_MAX_RESULTS', 1000))
+app.config['RESULTS_PER_PAGE'] = int(os.environ.get('RESULTS_PER_PAGE', 100))
+app.config['RAW_PREVIEW_CHARS'] = int(os.environ.get('RAW_PREVIEW_CHARS', 20_000))
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Load the latest trained spaCy model
-nlp = spacy.load('../custom_financial_ner')
-if 'sentencizer' not in nlp.pipe_names:
-    nlp.add_pipe('sentencizer')
+# The latest trained spaCy model is loaded lazily (or preloaded in the background)
+model_manager = ModelManager(
+    os.path.abspath(MODEL_DIR),
+    cache_dir=app.config['MODEL_CACHE_DIR'],
+    check_interval=app.config['MODEL_RELOAD_INTERVAL'],
+)
+# Job workers started with spawn/forkserver re-import this module when it is run as a script
+if app.config['MODEL_PRELOAD'] and multiprocessing.parent_process() is None:
+    model_manager.preload()
+
+metrics = Registry()
+REQUEST_LATENCY = metrics.histogram('http_request_duration_seconds', 'Request latency.', ['endpoint', 'method', 'status'])
+STAGE_LATENCY = metrics.histogram('extraction_stage_duration_seconds', 'Time spent per extraction stage.', ['stage'])
+DOCUMENTS = metrics.counter('extraction_documents', 'Documents processed.', ['type'])
+DOCUMENT_BYTES = metrics.histogram('extraction_document_bytes', 'Size of processed documents.', ['type'], SIZE_BUCKETS)
+ENTITY_GROUPS = metrics.histogram('extraction_entity_groups', 'Entity groups found per document.', ['type'], COUNT_BUCKETS)
+ENTITIES = metrics.counter('extraction_entities', 'Entity values extracted.', ['type'])
+ERRORS = metrics.counter('extraction_errors', 'Documents that failed to extract.', ['type'])
+PREFILTER_SENTENCES = metrics.counter('prefilter_sentences', 'Sentences seen by the NER pre-filter.', ['result'])
+
+result_cache = ResultCache(
+    max_entries=app.config['RESULT_CACHE_SIZE'],
+    disk_dir=app.config['RESULT_CACHE_DIR'],
+    disk_max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+    memory_max_bytes=app.config['RESULT_CACHE_MEMORY_BYTES'],
+)
+
+result_store = ResultStore(app.config['RESULTS_FOLDER'], max_results=app.config['RESULT_STORE_MAX_RESULTS'])
+
+def cache_job_result(job):
+    if job.payload and job.payload.get('cache_key'):
+        result_cache.put(job.payload['cache_key'], {'groups': job.groups})
+
+job_manager = JobManager(
+    os.path.abspath(MODEL_DIR),
+    model_cache_dir=app.config['MODEL_CACHE_DIR'],
+    model_reload_interval=app.config['MODEL_RELOAD_INTERVAL'],
+    workers=app.config['JOB_WORKERS'],
+    max_queue_depth=app.config['JOB_MAX_QUEUE_DEPTH'],
+    max_batch_size=app.config['JOB_MAX_BATCH_SIZE'],
+    start_method=app.config['JOB_START_METHOD'],
+    ner_options={
+        'chunk_chars': app.config['NER_CHUNK_CHARS'],
+        'batch_size': app.config['NER_BATCH_SIZE'],
+    },
+    tabular_fast_path=app.config['TABULAR_FAST_PATH'],
+    prefilter={'gazetteer': app.config['NER_GAZETTEER']} if app.config['NER_PREFILTER'] else None,
+    on_finish=cache_job_result,
+)
 
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(filepath):
-    text = ''
-    with pdfplumber.open(filepath) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + '\n'
-    return text
+def current_model():
+    """The model for this request, kept for its whole duration even if a reload lands."""
+    if not has_request_context():
+        return model_manager.get()
+    if 'model' not in g:
+        g.model = model_manager.get()
+    return g.model
+
+def request_timer():
+    """Stage timer of the current request (a throwaway one outside requests)."""
+    if not has_request_context():
+        return StageTimer(STAGE_LATENCY)
+    if 'timer' not in g:
+        g.timer = StageTimer(STAGE_LATENCY)
+    return g.timer
+
+_profile_lock = threading.Lock()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.timer = StageTimer(STAGE_LATENCY)
+    if app.config['PROFILE_REQUESTS'] or (app.config['PROFILE_ALLOW_HEADER'] and request.headers.get('X-Profile')):
+        # One profile at a time: Python 3.12+ refuses a second active cProfile, and
+        # concurrent requests would muddle each other's profiles anyway
+        if _profile_lock.acquire(blocking=False):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+@app.after_request
+def record_request_metrics(response):
+    elapsed = time.perf_counter() - g.request_started
+    REQUEST_LATENCY.observe(elapsed, endpoint=request.endpoint or 'unknown', method=request.method, status=response.status_code)
+    if 'model' in g and model_manager.first_request_seconds is None:
+        model_manager.record_first_request(elapsed)
+    if elapsed >= app.config['SLOW_REQUEST_SECONDS']:
+        app.logger.warning('Slow request %s %s took %.3fs: %s', request.method, request.path, elapsed, g.timer.breakdown() or 'no stages')
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        try:
+            profiler.disable()
+            os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+            path = os.path.join(app.config['PROFILE_DIR'], f'{time.strftime("%Y%m%d-%H%M%S")}-{request.endpoint or "unknown"}-{uuid.uuid4().hex[:8]}.prof')
+            profiler.dump_stats(path)
+            prune_profiles()
+        finally:
+            _profile_lock.release()
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(25)
+        app.logger.info('Profile for %s %s saved to %s\n%s', request.method, request.path, path, summary.getvalue())
+        response.headers['X-Profile-File'] = os.path.basename(path)
+    return response
+
+@app.teardown_request
+def stop_profiler(exc):
+    # after_request is skipped when the view raises
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _profile_lock.release()
 
-def extract_text_from_xls(filepath):
-    df_file = pd.read_excel(filepath)
-    return df_file.to_csv(index=False)
+def prune_profiles():
+    """Keep only the newest PROFILE_MAX_FILES profiles."""
+    entries = [entry for entry in os.scandir(app.config['PROFILE_DIR']) if entry.name.endswith('.prof')]
+    if len(entries) <= app.config['PROFILE_MAX_FILES']:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:len(entries) - app.config['PROFILE_MAX_FILES']]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
 
-def extract_text_from_csv(filepath):
-    df_file = pd.read_csv(filepath)
-    return df_file.to_csv(index=False)
+def current_prefilter():
+    if not app.config['NER_PREFILTER']:
+        return None
+    return prefilter_for(current_model(), app.config['NER_GAZETTEER'], counter=PREFILTER_SENTENCES)
+
+def cache_version():
+    """Model version plus the settings that change the groups, for cache keys and result ids."""
+    prefilter = current_prefilter()
+    return extraction_version(
+        current_model().version,
+        chunk_chars=app.config['NER_CHUNK_CHARS'],
+        prefilter=prefilter.fingerprint if prefilter is not None else None,
+        tabular_fast_path=app.config['TABULAR_FAST_PATH'],
+    )
 
 def extract_financial_entities_grouped(text):
-    doc = nlp(text)
-    # Group entities by sentence, and within each sentence by company
-    results = []
-    for sent in doc.sents:
-        sent_ents = [ent for ent in sent.ents]
-        companies = [ent for ent in sent_ents if ent.label_ == 'COMPANY']
-        # If no company, treat as 'Unknown'
-        if not companies:
-            group = {'COMPANY': 'Unknown'}
-            for ent in sent_ents:
-                group[ent.label_] = ent.text.strip()
-            results.append(group)
-        else:
-            for company in companies:
-                group = {'COMPANY': company.text.strip()}
-                for ent in sent_ents:
-                    if ent is company:
-                        continue
-                    if ent.label_ != 'COMPANY':
-                        group[ent.label_] = ent.text.strip()
-                results.append(group)
-    # Remove duplicates
-    unique_results = []
-    seen = set()
-    for group in results:
-        key = tuple(sorted(group.items()))
-        if key not in seen:
-            unique_results.append(group)
-            seen.add(key)
-    return unique_results
+    # Sentence-aligned chunks through nlp.pipe; groups are de-duplicated across chunks
+    timer = request_timer()
+    timings = {}
+    pieces = text if isinstance(text, str) else TimedIterator(text)
+    groups = extract_grouped(
+        current_model().nlp, pieces,
+        chunk_chars=app.config['NER_CHUNK_CHARS'],
+        batch_size=app.config['NER_BATCH_SIZE'],
+        n_process=app.config['NER_N_PROCESS'],
+        timings=timings,
+        prefilter=current_prefilter(),
+    )
+    if not isinstance(text, str):
+        # Streamed input (PDF pages) is produced while the model waits for it
+        timer.record('text_extraction', pieces.seconds)
+        timings['ner'] -= pieces.seconds
+    timer.record('ner', timings['ner'])
+    timer.record('grouping', timings['grouping'])
+    return groups
+
+def log_pdf_progress(page_number, page_count, seconds):
+    if page_number == page_count or page_number % 50 == 0:
+        app.logger.info('PDF progress: page %d/%d (last page %.3fs)', page_number, page_count, seconds)
+
+def extract_upload(filepath, ext):
+    """Return (text, groups) for a saved upload, overlapping text extraction with NER.
+
+    For PDFs and on the tabular fast path the text is an iterator of blocks,
+    only read or rendered as the result store writes it.
+    """
+    timer = request_timer()
+    if ext in TABULAR_EXTENSIONS and app.config['TABULAR_FAST_PATH']:
+        with timer.stage('tabular_extraction'):
+            df, groups = extract_grouped_from_table(filepath, ext, current_model().nlp.get_pipe('ner').labels)
+        if groups is None:
+            text = ''.join(iter_table_csv(df))
+            return text, cached_groups(text)
+        return iter_table_csv(df), groups
+    if ext != 'pdf':
+        with timer.stage('text_extraction'):
+            text = extract_text_from_file(filepath, ext)
+        return text, cached_groups(text)
+    # Pages are spooled to a temporary file as NER consumes them and read back by the result store
+    spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+    def stream():
+        for piece in iter_text_from_file(filepath, ext, n_process=app.config['PDF_N_PROCESS'], progress=log_pdf_progress):
+            spool.write(piece)
+            yield piece
+    try:
+        groups = extract_financial_entities_grouped(stream())
+    except BaseException:
+        spool.close()
+        raise
+    return iter_spooled(spool), groups
+
+def iter_spooled(spool, size=1024 * 1024):
+    with spool:
+        spool.seek(0)
+        yield from iter(lambda: spool.read(size), '')
+
+def cached_groups(text):
+    key = text_key(text, cache_version())
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached['groups']
+    groups = extract_financial_entities_grouped(text)
+    result_cache.put(key, {'groups': groups})
+    return groups
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
-    selected_labels = []
-    groups = []
-    raw_text = ''
-    labels = []
     if request.method == 'POST':
         input_text = request.form.get('input_text', '').strip()
         file = request.files.get('file')
-        extracted_text = ''
         filename = None
+        timer = request_timer()
         if file and allowed_file(file.filename):
             filename = file.filename
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
             ext = filename.rsplit('.', 1)[1].lower()
-            if ext == 'pdf':
-                extracted_text = extract_text_from_pdf(filepath)
-            elif ext in ['xls', 'xlsx']:
-                extracted_text = extract_text_from_xls(filepath)
-            elif ext == 'csv':
-                extracted_text = extract_text_from_csv(filepath)
-            elif ext == 'txt':
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    extracted_text = f.read()
+            doc_type = ext
         elif input_text:
-            extracted_text = input_text
+            doc_type = 'text'
         else:
             return render_template('index.html', error='Please upload a file or paste text.')
-        groups = extract_financial_entities_grouped(extracted_text)
-        # Collect all labels for checkboxes
-        all_labels = set()
-        for group in groups:
-            all_labels.update(group.keys())
-        labels = sorted(all_labels)
-        raw_text = extracted_text
-        # Handle label selection
-        selected_labels = request.form.getlist('selected_labels')
-        if not selected_labels:
-            selected_labels = labels  # default: show all
-        # Filter group fields
-        filtered_groups = []
-        for group in groups:
-            filtered = {k: v for k, v in group.items() if k in selected_labels}
-            filtered_groups.append(filtered)
-        return render_template('result.html', groups=filtered_groups, labels=labels, selected_labels=selected_labels, raw_text=raw_text)
+        try:
+            if filename is not None:
+                data = file.read()
+                size = len(data)
+                # Repeat uploads of the same file skip both text extraction and NER; the
+                # text itself is only kept in the result store
+                upload_key = file_key(data, ext, cache_version())
+                cached = result_cache.get(upload_key)
+                if cached is not None and 'result_id' in cached and result_store.exists(cached['result_id']):
+                    result_id = cached['result_id']
+                    groups = cached['groups']
+                else:
+                    # Unique name: concurrent uploads of the same file name must not overwrite each other
+                    filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'{uuid.uuid4().hex}-{secure_filename(filename)}')
+                    with timer.stage('file_save'):
+                        with open(filepath, 'wb') as f:
+                            f.write(data)
+                    try:
+                        extracted_text, groups = extract_upload(filepath, ext)
+                        # Uploads are stored under a hash of their content, so streamed text needs no hashing
+                        result_id = hashlib.sha256(upload_key.encode('utf-8')).hexdigest()
+                        with timer.stage('store'):
+                            result_store.save(result_id, extracted_text, groups)
+                    finally:
+                        os.remove(filepath)
+                    result_cache.put(upload_key, {'result_id': result_id, 'groups': groups})
+            else:
+                size = len(input_text.encode('utf-8'))
+                groups = cached_groups(input_text)
+                result_id = text_key(input_text, cache_version())
+                with timer.stage('store'):
+                    result_store.save(result_id, input_text, groups)
+        except Exception:
+            ERRORS.inc(type=doc_type)
+            raise
+        DOCUMENTS.inc(type=doc_type)
+        DOCUMENT_BYTES.observe(size, type=doc_type)
+        ENTITY_GROUPS.observe(len(groups), type=doc_type)
+        # Not the COMPANY: Unknown placeholder of groups without a company
+        ENTITIES.inc(sum(len(group) - (group.get('COMPANY') == 'Unknown') for group in groups), type=doc_type)
+        return redirect(url_for('show_result', result_id=result_id), code=303)
     return render_template('index.html')
 
+def load_result_meta(result_id):
+    try:
+        return result_store.meta(result_id)
+    except (KeyError, OSError):
+        abort(404)
+
+def selected_result_labels(meta):
+    selected = [label for label in request.args.getlist('selected_labels') if label in meta['labels']]
+    return selected or meta['labels']  # default: show all
+
+@app.route('/results/<result_id>')
+def show_result(result_id):
+    meta = load_result_meta(result_id)
+    labels = meta['labels']
+    selected_labels = selected_result_labels(meta)
+    per_page = min(max(request.args.get('per_page', app.config['RESULTS_PER_PAGE'], type=int), 1), 1000)
+    page_count = max(1, -(-meta['count'] // per_page))
+    page = min(max(request.args.get('page', 1, type=int), 1), page_count)
+    try:
+        groups = result_store.page(result_id, page, per_page, meta=meta)
+        raw_preview = result_store.raw_preview(result_id, app.config['RAW_PREVIEW_CHARS'])
+    except OSError:
+        # Pruned after the meta was read
+        abort(404)
+    with request_timer().stage('render'):
+        return render_template('result.html', result_id=result_id, groups=groups, labels=labels,
+                               selected_labels=selected_labels, page=page, per_page=per_page,
+                               page_count=page_count, total=meta['count'], raw_preview=raw_preview,
+                               raw_chars=meta['raw_chars'])
+
+def open_result(iter_func, result_id, **kwargs):
+    """Open a stored result for streaming, or 404 if it is gone."""
+    try:
+        return iter_func(result_id, **kwargs)
+    except (KeyError, OSError):
+        abort(404)
+
+def guarded_stream(chunks, result_id):
+    # Headers are already sent: a read error can only end the stream early
+    try:
+        yield from chunks
+    except OSError:
+        app.logger.exception('Streaming result %s failed', result_id)
+
+@app.route('/results/<result_id>/raw')
+def result_raw(result_id):
+    chunks = open_result(result_store.iter_raw, result_id)
+    return Response(guarded_stream(chunks, result_id), mimetype='text/plain; charset=utf-8')
+
+@app.route('/results/<result_id>/export.csv')
+def export_result_csv(result_id):
+    meta = load_result_meta(result_id)
+    columns = selected_result_labels(meta)
+    groups = open_result(result_store.iter_groups, result_id, meta=meta)
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for i, group in enumerate(groups):
+            writer.writerow([group.get(label, '') for label in columns])
+            if i % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    response = Response(guarded_stream(generate(), result_id), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={result_id[:12]}.csv'
+    return response
+
+@app.route('/results/<result_id>/export.jsonl')
+def export_result_jsonl(result_id):
+    meta = load_result_meta(result_id)
+    columns = set(selected_result_labels(meta))
+    groups = open_result(result_store.iter_groups, result_id, meta=meta)
+    def generate():
+        for group in groups:
+            yield json.dumps({k: v for k, v in group.items() if k in columns}) + '\n'
+    response = Response(guarded_stream(generate(), result_id), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename={result_id[:12]}.jsonl'
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/model')
+def model_status():
+    return jsonify(model_manager.status())
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+def collect_api_documents():
+    """Build (name, payload) items and cached groups from a bulk API request."""
+    items = []
+    precomputed = {}
+    if request.files:
+        files = request.files.getlist('files')
+        for file in files:
+            if not (file and allowed_file(file.filename)):
+                raise ValueError(f'Unsupported file: {file.filename!r}')
+        for file in files:
+            ext = file.filename.rsplit('.', 1)[1].lower()
+            data = file.read()
+            cached = result_cache.get(file_key(data, ext, cache_version()))
+            if cached is not None:
+                precomputed[len(items)] = cached['groups']
+                items.append((file.filename, None))
+                continue
+            path = os.path.join(app.config['UPLOAD_FOLDER'], f'{uuid.uuid4().hex}-{secure_filename(file.filename)}')
+            with open(path, 'wb') as f:
+                f.write(data)
+            items.append((file.filename, {'path': path, 'ext': ext}))
+    else:
+        body = request.get_json(silent=True)
+        if body is None:
+            body = {}
+        if not isinstance(body, dict):
+            raise ValueError('Request body must be a JSON object.')
+        documents = body.get('documents')
+        if not documents:
+            texts = body.get('texts') or []
+            if not isinstance(texts, list):
+                raise ValueError("'texts' must be a list.")
+            documents = [{'text': text} for text in texts]
+        if not isinstance(documents, list):
+            raise ValueError("'documents' must be a list.")
+        for index, document in enumerate(documents):
+            text = document.get('text') if isinstance(document, dict) else None
+            if not isinstance(text, str):
+                raise ValueError(f'Document {index} has no text.')
+            key = text_key(text, cache_version())
+            cached = result_cache.get(key)
+            if cached is not None:
+                precomputed[len(items)] = cached['groups']
+                items.append((document.get('name', str(index)), None))
+                continue
+            items.append((document.get('name', str(index)), {'text': text, 'cache_key': key}))
+    return items, precomputed
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_jobs():
+    try:
+        items, precomputed = collect_api_documents()
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    try:
+        batch_id, job_ids = job_manager.submit_batch(items, precomputed)
+    except QueueFull as e:
+        discard_api_uploads(items)
+        response = jsonify(error=str(e))
+        response.status_code = 429
+        response.headers['Retry-After'] = '30'
+        return response
+    except ValueError as e:
+        discard_api_uploads(items)
+        return jsonify(error=str(e)), 400
+    return jsonify(batch_id=batch_id, job_ids=job_ids), 202
+
+def discard_api_uploads(items):
+    for _, payload in items:
+        if payload and 'path' in payload and os.path.exists(payload['path']):
+            os.remove(payload['path'])
+
+@app.route('/api/jobs/<job_id>')
+def api_job(job_id):
+    job = job_manager.get_job(job_id)
+    if job is None:
+        return jsonify(error='Unknown job.'), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/batches/<batch_id>')
+def api_batch(batch_id):
+    jobs = job_manager.get_batch(batch_id)
+    if jobs is None:
+        return jsonify(error='Unknown batch.'), 404
+    counts = {}
+    for job in jobs:
+        counts[job.status] = counts.get(job.status, 0) + 1
+    return jsonify(batch_id=batch_id, counts=counts, jobs=[{'id': job.id, 'name': job.name, 'status': job.status} for job in jobs])
+
+@app.route('/api/batches/<batch_id>/results')
+def api_batch_results(batch_id):
+    # JSON Lines, one job per line in submission order, streamed as jobs finish
+    jobs = job_manager.get_batch(batch_id)
+    if jobs is None:
+        return jsonify(error='Unknown batch.'), 404
+    timeout = request.args.get('timeout', type=float)
+    def generate():
+        for job in job_manager.iter_results(jobs, timeout=timeout):
+            yield json.dumps(job.to_dict()) + '\n'
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/api/stats')
+def api_stats():
+    return jsonify(job_manager.stats())
+
 if __name__ == '__main__':
     app.run(debug=True)
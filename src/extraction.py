@@ -0,0 +1,150 @@
+"""Chunked NER extraction engine for large documents.
+
+Text is split into chunks that end on sentence boundaries, so every sentence
+the sentencizer would find in the full document is still found whole in
+exactly one chunk. Chunks are streamed through ``nlp.pipe`` and the
+per-sentence COMPANY groups are de-duplicated across the whole stream.
+
+The groups match a single ``nlp()`` call over the whole text except at
+chunk edges, in two ways:
+
+* The NER model reads a few tokens on either side of each word, across
+  sentence ends. The first and last sentences of a chunk lose that context,
+  so their entities can differ slightly.
+* Lines are cut after sentence punctuation at the end of a line. Within
+  very long lines, the cut is after ". " and, failing that, at whitespace.
+  A period the tokenizer keeps inside a token (e.g. "Inc. ") or a plain
+  whitespace cut can split a sentence across two chunks.
+
+Text with line breaks at sentence ends, such as extracted PDF pages and CSV
+rows, is only affected in the first way.
+"""
+import re
+import time
+
+from metrics import TimedIterator
+
+# Upper bound on characters per chunk handed to the model. Peak memory is set
+# by this value rather than by the document size.
+DEFAULT_CHUNK_CHARS = 100_000
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_N_PROCESS = 1
+
+# A line ending in sentence punctuation: the sentencizer always splits there.
+_LINE_BOUNDARY = re.compile(r'[.!?]["\')\]]*[ \t]*(?=\n)')
+# Inside very long lines fall back to ". " style boundaries, then whitespace. The
+# cut goes after the spaces: a chunk starting with one would get a whitespace
+# token the full document does not have.
+_INLINE_BOUNDARY = re.compile(r'[.!?]["\')\]]* +(?=\S)')
+_WHITESPACE = re.compile(r'\s')
+
+
+def _find_split(text, start, end):
+    """Return the index to cut ``text[start:end]`` at, never ``start`` itself."""
+    for pattern in (_LINE_BOUNDARY, _INLINE_BOUNDARY):
+        cut = None
+        for match in pattern.finditer(text, start, end):
+            cut = match.end()
+        if cut and cut > start:
+            return cut
+    cut = None
+    for match in _WHITESPACE.finditer(text, start, end):
+        cut = match.end()
+    return cut or end
+
+
+def iter_chunks(pieces, max_chars=DEFAULT_CHUNK_CHARS):
+    """Yield chunks of at most ``max_chars`` from an iterable of text pieces.
+
+    Pieces (e.g. pages) are treated as one continuous text; a sentence that
+    runs across two pieces is carried over into the next chunk.
+    """
+    buffer = ''
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer += piece
+        start = 0
+        while len(buffer) - start > max_chars:
+            cut = _find_split(buffer, start, start + max_chars)
+            yield buffer[start:cut]
+            start = cut
+        buffer = buffer[start:]
+    if buffer:
+        yield buffer
+
+
+def group_sentence_entities(sent_ents):
+    """Group the entities of one sentence by company."""
+    companies = [ent for ent in sent_ents if ent.label_ == 'COMPANY']
+    # If no company, treat as 'Unknown'
+    if not companies:
+        group = {'COMPANY': 'Unknown'}
+        for ent in sent_ents:
+            group[ent.label_] = ent.text.strip()
+        yield group
+        return
+    for company in companies:
+        group = {'COMPANY': company.text.strip()}
+        for ent in sent_ents:
+            if ent is company:
+                continue
+            if ent.label_ != 'COMPANY':
+                group[ent.label_] = ent.text.strip()
+        yield group
+
+
+def iter_doc_groups(doc):
+    # One pass over doc.ents: Span.ents rescans every entity of the doc per
+    # sentence, which is quadratic on long chunks.
+    ents = doc.ents
+    i = 0
+    for sent in doc.sents:
+        sent_ents = []
+        while i < len(ents) and ents[i].start < sent.end:
+            if ents[i].start >= sent.start and ents[i].end <= sent.end:
+                sent_ents.append(ents[i])
+            i += 1
+        yield from group_sentence_entities(sent_ents)
+
+
+def dedupe_groups(groups):
+    """Drop repeated groups, keeping the first occurrence order."""
+    seen = set()
+    for group in groups:
+        key = tuple(sorted(group.items()))
+        if key not in seen:
+            seen.add(key)
+            yield group
+
+
+def extract_grouped(nlp, pieces, chunk_chars=DEFAULT_CHUNK_CHARS,
+                    batch_size=DEFAULT_BATCH_SIZE, n_process=DEFAULT_N_PROCESS, timings=None,
+                    prefilter=None):
+    """Run ``nlp`` over ``pieces`` chunk by chunk and return unique groups.
+
+    ``pieces`` is a string or any iterable of strings; it is consumed lazily.
+    If ``timings`` is a dict, the seconds spent waiting on the model ('ner')
+    and grouping/de-duplicating ('grouping') are added to it. With a
+    ``prefilter.SentencePrefilter`` only the sentences it passes are run
+    through the NER component, in the ``n_process`` workers like full NER.
+    """
+    if isinstance(pieces, str):
+        pieces = [pieces]
+    chunk_chars = min(chunk_chars, nlp.max_length)
+    if prefilter is None:
+        docs = nlp.pipe(iter_chunks(pieces, chunk_chars),
+                        batch_size=batch_size, n_process=n_process)
+    else:
+        # The filter and sentence-level NER run inside the pipe workers too
+        docs = prefilter.pipe(iter_chunks(pieces, chunk_chars),
+                              batch_size=batch_size, n_process=n_process)
+    if timings is None:
+        return list(dedupe_groups(group for doc in docs for group in iter_doc_groups(doc)))
+    docs = TimedIterator(docs)
+    began = time.perf_counter()
+    groups = list(dedupe_groups(group for doc in docs for group in iter_doc_groups(doc)))
+    elapsed = time.perf_counter() - began
+    timings['ner'] = timings.get('ner', 0.0) + docs.seconds
+    timings['grouping'] = timings.get('grouping', 0.0) + elapsed - docs.seconds
+    return groups
@@ -0,0 +1,258 @@
+"""Background extraction jobs for the bulk JSON API.
+
+Jobs run in a pool of worker processes that each load the NER model once.
+Batches are fed to the pool round-robin with a bounded number of jobs in
+flight, so one large batch cannot starve the others, and submissions are
+refused once the queue is full.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from extraction import extract_grouped
+from model_manager import ModelManager
+from prefilter import prefilter_for
+from tabular import TABULAR_EXTENSIONS, extract_grouped_from_table, iter_table_csv
+from text_extraction import default_start_method, iter_text_from_file
+
+logger = logging.getLogger(__name__)
+
+# Per-process model, loaded once by the pool initializer and reloaded when it changes
+_worker_models = None
+_worker_options = {}
+_worker_tabular = True
+_worker_prefilter = None
+
+
+def _init_worker(model_dir, cache_dir, reload_interval, options, tabular_fast_path, prefilter):
+    global _worker_models, _worker_options, _worker_tabular, _worker_prefilter
+    _worker_models = ModelManager(model_dir, cache_dir=cache_dir, check_interval=reload_interval,
+                                  background_reload=False)
+    _worker_models.get()
+    _worker_options = options
+    _worker_tabular = tabular_fast_path
+    _worker_prefilter = prefilter
+
+
+def _run_job(payload):
+    model = _worker_models.get()
+    nlp = model.nlp
+    options = _worker_options
+    if _worker_prefilter is not None:
+        options = dict(options, prefilter=prefilter_for(model, _worker_prefilter.get('gazetteer')))
+    if 'path' in payload:
+        # PDF pages stream straight into the model as they are extracted
+        try:
+            if payload['ext'] in TABULAR_EXTENSIONS and _worker_tabular:
+                df, groups = extract_grouped_from_table(
+                    payload['path'], payload['ext'], nlp.get_pipe('ner').labels)
+                if groups is not None:
+                    return groups
+                return extract_grouped(nlp, iter_table_csv(df), **options)
+            pieces = iter_text_from_file(payload['path'], payload['ext'])
+            return extract_grouped(nlp, pieces, **options)
+        finally:
+            os.remove(payload['path'])
+    return extract_grouped(nlp, payload['text'], **options)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, batch_id, name, payload):
+        self.id = job_id
+        self.batch_id = batch_id
+        self.name = name
+        self.payload = payload
+        self.status = 'queued'
+        self.groups = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        data = {'id': self.id, 'batch_id': self.batch_id, 'name': self.name, 'status': self.status}
+        if self.groups is not None:
+            data['groups'] = self.groups
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+class JobManager:
+    def __init__(self, model_dir, model_cache_dir=None, model_reload_interval=5.0, workers=None, max_queue_depth=1000, max_batch_size=500,
+                 max_in_flight=None, keep_finished=10000, start_method=None, ner_options=None,
+                 tabular_fast_path=True, prefilter=None, on_finish=None):
+        self.model_dir = model_dir
+        self.model_cache_dir = model_cache_dir
+        self.model_reload_interval = model_reload_interval
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_queue_depth = max_queue_depth
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.keep_finished = keep_finished
+        # Not fork: the app process already runs model, reload and PDF pool threads
+        self.start_method = start_method or default_start_method()
+        self.ner_options = ner_options or {}
+        self.tabular_fast_path = tabular_fast_path
+        # Sentence pre-filter options ({'gazetteer': path}); None runs full NER
+        self.prefilter = prefilter
+        # Called with each successfully finished job, e.g. to fill the result cache
+        self.on_finish = on_finish
+        self._executor = None
+        # Re-entrant: a future that is already done runs its callback inside _dispatch
+        self._lock = threading.RLock()
+        self._jobs = {}
+        self._batches = {}
+        # batch_id -> deque of queued jobs, served round-robin
+        self._pending = OrderedDict()
+        self._queued = 0
+        self._in_flight = 0
+        self._finished = deque()
+
+    def _get_executor(self):
+        # Started lazily so that the interactive app pays nothing until the API is used
+        if self._executor is None:
+            context = multiprocessing.get_context(self.start_method)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.model_dir, self.model_cache_dir, self.model_reload_interval,
+                          self.ner_options, self.tabular_fast_path, self.prefilter),
+            )
+        return self._executor
+
+    def _submit(self, payload):
+        # Caller holds the lock
+        try:
+            return self._get_executor().submit(_run_job, payload)
+        except BrokenProcessPool:
+            # A worker died (OOM kill, segfault): its jobs failed, start a fresh pool
+            logger.warning('Job pool is broken; starting a new one')
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            return self._get_executor().submit(_run_job, payload)
+
+    def submit_batch(self, items, precomputed=None):
+        """Queue ``items`` (name, payload) pairs and return (batch_id, job ids).
+
+        ``precomputed`` maps an item index to already known groups, e.g. from
+        the result cache; those jobs finish immediately.
+        """
+        if not items:
+            raise ValueError('Batch is empty.')
+        if len(items) > self.max_batch_size:
+            raise ValueError(f'Batch has {len(items)} documents; the limit is {self.max_batch_size}.')
+        precomputed = precomputed or {}
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            to_queue = len(items) - len(precomputed)
+            if self._queued + self._in_flight + to_queue > self.max_queue_depth:
+                raise QueueFull(f'Queue is full ({self._queued + self._in_flight} jobs pending).')
+            jobs = []
+            pending = deque()
+            for index, (name, payload) in enumerate(items):
+                job = Job(uuid.uuid4().hex, batch_id, name, payload)
+                self._jobs[job.id] = job
+                jobs.append(job)
+                if index in precomputed:
+                    self._finish(job, groups=precomputed[index])
+                else:
+                    pending.append(job)
+            self._batches[batch_id] = [job.id for job in jobs]
+            if pending:
+                self._pending[batch_id] = pending
+                self._queued += len(pending)
+            self._dispatch()
+        return batch_id, [job.id for job in jobs]
+
+    def _dispatch(self):
+        # Caller holds the lock
+        while self._pending and self._in_flight < self.max_in_flight:
+            batch_id, pending = next(iter(self._pending.items()))
+            job = pending.popleft()
+            if pending:
+                self._pending.move_to_end(batch_id)
+            else:
+                del self._pending[batch_id]
+            self._queued -= 1
+            try:
+                future = self._submit(job.payload)
+            except Exception as error:
+                logger.exception('Could not submit job %s', job.id)
+                self._finish(job, error=f'{type(error).__name__}: {error}')
+                continue
+            self._in_flight += 1
+            job.status = 'running'
+            future.add_done_callback(lambda f, job=job: self._on_done(job, f))
+
+    def _on_done(self, job, future):
+        with self._lock:
+            self._in_flight -= 1
+            error = future.exception()
+            if error is None:
+                self._finish(job, groups=future.result())
+            else:
+                self._finish(job, error=f'{type(error).__name__}: {error}')
+            self._dispatch()
+
+    def _finish(self, job, groups=None, error=None):
+        # Caller holds the lock
+        job.groups = groups
+        job.error = error
+        job.status = 'failed' if error is not None else 'done'
+        job.finished_at = time.time()
+        job.done.set()
+        self._finished.append(job.id)
+        if error is None and self.on_finish is not None:
+            # After the job is final: a failing callback must not strand waiters or the queue
+            try:
+                self.on_finish(job)
+            except Exception:
+                logger.exception('on_finish failed for job %s', job.id)
+        job.payload = None
+        while len(self._finished) > self.keep_finished:
+            old = self._jobs.pop(self._finished.popleft(), None)
+            if old is not None:
+                batch = self._batches.get(old.batch_id)
+                if batch is not None and all(job_id not in self._jobs for job_id in batch):
+                    del self._batches[old.batch_id]
+
+    def get_job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def get_batch(self, batch_id):
+        job_ids = self._batches.get(batch_id)
+        if job_ids is None:
+            return None
+        return [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs]
+
+    def iter_results(self, jobs, timeout=None):
+        """Yield jobs in submission order as each one finishes."""
+        deadline = None if timeout is None else time.time() + timeout
+        for job in jobs:
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            job.done.wait(remaining)
+            yield job
+
+    def stats(self):
+        with self._lock:
+            counts = {'queued': self._queued, 'running': self._in_flight}
+            counts['finished'] = len(self._finished)
+            counts['workers'] = self.workers
+            counts['max_queue_depth'] = self.max_queue_depth
+            return counts
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,176 @@
+"""Lazy loading, warmup and hot reload of the NER pipeline.
+
+The assembled pipeline (model plus sentencizer) is saved once per model
+version under ``cache_dir`` so other workers load it ready to use. When the
+model's meta.json changes, the new version is loaded and warmed up in the
+background and then swapped in; requests that already hold the old model
+finish with it.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import spacy
+
+from result_cache import model_version
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = (
+    "AAPL reported a revenue of 394328.0 crore for the year 2022. "
+    "The ROE for MSFT in 2021 was 43.1 percent.\n"
+    "This sentence has no figures in it."
+)
+
+
+def _prune_cache(cache_dir, keep):
+    entries = [entry for entry in os.scandir(cache_dir) if entry.is_dir() and not entry.name.startswith('.')]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def load_pipeline(model_dir, cache_dir=None, keep_cached=3):
+    """Load the model in ``model_dir`` with a sentencizer; returns (nlp, version)."""
+    # Hash and load the same directory even if the trainer swaps the path meanwhile
+    model_dir = os.path.realpath(model_dir)
+    version = model_version(model_dir)
+    cached_dir = os.path.join(cache_dir, version) if cache_dir else None
+    if cached_dir and os.path.isdir(cached_dir):
+        os.utime(cached_dir)
+        return spacy.load(cached_dir), version
+    nlp = spacy.load(model_dir)
+    if 'sentencizer' not in nlp.pipe_names:
+        nlp.add_pipe('sentencizer')
+    if cached_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=cache_dir)
+        try:
+            nlp.to_disk(tmp_dir)
+            os.rename(tmp_dir, cached_dir)
+        except OSError:
+            # Another worker got there first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        _prune_cache(cache_dir, keep_cached)
+    return nlp, version
+
+
+class LoadedModel:
+    def __init__(self, nlp, version, load_seconds, warmup_seconds):
+        self.nlp = nlp
+        self.version = version
+        self.load_seconds = load_seconds
+        self.warmup_seconds = warmup_seconds
+        self.loaded_at = time.time()
+        # Sentence pre-filter bound to this model's vocab, built on first use
+        self.prefilter = None
+
+
+class ModelManager:
+    def __init__(self, model_dir, cache_dir=None, check_interval=5.0, background_reload=True):
+        self.model_dir = model_dir
+        self.cache_dir = cache_dir
+        self.check_interval = check_interval
+        self.background_reload = background_reload
+        self.reloads = 0
+        self.reload_errors = 0
+        self.first_request_seconds = None
+        self._current = None
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    def _meta_signature(self):
+        try:
+            path = os.path.realpath(os.path.join(self.model_dir, 'meta.json'))
+            stat = os.stat(path)
+        except OSError:
+            # Mid-swap by the trainer; keep serving the current model
+            return None
+        # The path and inode change when the trainer swaps in a new directory
+        return path, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        began = time.perf_counter()
+        signature = self._meta_signature()
+        nlp, version = load_pipeline(self.model_dir, self.cache_dir)
+        loaded = time.perf_counter()
+        nlp(WARMUP_TEXT)
+        warmed = time.perf_counter()
+        model = LoadedModel(nlp, version, loaded - began, warmed - loaded)
+        logger.info('Loaded model %s in %.2fs (warmup %.3fs)', version, model.load_seconds, model.warmup_seconds)
+        return model, signature
+
+    def get(self):
+        """Return the current LoadedModel, loading it on first use."""
+        model = self._current
+        if model is None:
+            with self._lock:
+                if self._current is None:
+                    self._current, self._signature = self._load()
+                model = self._current
+        elif time.monotonic() >= self._next_check:
+            self._check_for_update()
+            model = self._current
+        return model
+
+    def preload(self):
+        """Load in a background thread so the first request does not wait."""
+        threading.Thread(target=self.get, name='model-preload', daemon=True).start()
+
+    def _check_for_update(self):
+        self._next_check = time.monotonic() + self.check_interval
+        signature = self._meta_signature()
+        if signature is None or signature == self._signature:
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        if self.background_reload:
+            threading.Thread(target=self._reload, name='model-reload', daemon=True).start()
+        else:
+            self._reload()
+
+    def _reload(self):
+        try:
+            model, signature = self._load()
+        except Exception:
+            self.reload_errors += 1
+            logger.exception('Reloading model from %s failed; keeping %s', self.model_dir, self._current.version)
+            with self._lock:
+                self._reloading = False
+            return
+        with self._lock:
+            # A single reference swap: in-flight requests keep the model they already hold
+            previous = self._current
+            self._current = model
+            self._signature = signature
+            self._reloading = False
+            if previous is None or previous.version != model.version:
+                self.reloads += 1
+
+    def record_first_request(self, seconds):
+        if self.first_request_seconds is None:
+            self.first_request_seconds = seconds
+            logger.info('First request served in %.3fs', seconds)
+
+    def status(self):
+        model = self._current
+        status = {
+            'model_dir': self.model_dir,
+            'loaded': model is not None,
+            'reloads': self.reloads,
+            'reload_errors': self.reload_errors,
+            'first_request_seconds': self.first_request_seconds,
+        }
+        if model is not None:
+            status.update(version=model.version, load_seconds=model.load_seconds,
+                          warmup_seconds=model.warmup_seconds, loaded_at=model.loaded_at)
+            if model.prefilter is not None:
+                status['prefilter'] = model.prefilter.stats()
+        return status
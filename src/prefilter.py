@@ -0,0 +1,196 @@
+"""Cheap sentence pre-filter in front of the statistical NER component.
+
+A sentence only goes to the NER model if it contains a digit or a known
+company name. Gazetteer companies come from the statements dataset and their
+matched spans are preset on the sentence, so the model only has to find the
+remaining entities. The COMPANY names the model emitted on its dev set
+(recorded in its meta by train_spacy_ner.py) only let a sentence through:
+they are not curated, so presetting them would turn the model's false
+positives into fixed output. Nothing is learned at runtime, so the result
+for a text depends only on the model and the gazetteer.
+
+The filter and the sentence-level NER run as the ``sentence_prefilter``
+component of a small pipeline (tokenizer, sentencizer, filter) sharing the
+model's vocab and NER component, so ``nlp.pipe(n_process=N)`` spreads all of
+the NER work over the worker processes. The entities found are written back
+onto the chunk Doc, which is then grouped like a fully tagged one.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc, Span
+from spacy.util import filter_spans
+
+logger = logging.getLogger(__name__)
+
+_DIGIT = re.compile(r'\d')
+
+
+def load_gazetteer(path):
+    """Company names from the 'Company' column of a statements CSV/XLSX."""
+    if path.endswith('.csv'):
+        df = pd.read_csv(path, encoding='utf-8-sig')
+    else:
+        df = pd.read_excel(path)
+    df.columns = [col.strip() for col in df.columns]
+    if 'Company' not in df.columns:
+        return []
+    return sorted({str(name).strip() for name in df['Company'].dropna()} - {''})
+
+
+class SentencePrefilter:
+    def __init__(self, nlp, companies=(), emitted_companies=(), counter=None):
+        # Optional metrics.Counter with a 'result' label (passed/skipped)
+        self.counter = counter
+        self.companies = {name for name in companies if name}
+        self.emitted_companies = {name for name in emitted_companies if name and name != 'Unknown'} - self.companies
+        # Built once and only read afterwards, so matching needs no lock
+        self.matcher = PhraseMatcher(nlp.vocab)
+        if self.companies:
+            self.matcher.add('COMPANY', list(nlp.tokenizer.pipe(sorted(self.companies))))
+        if self.emitted_companies:
+            self.matcher.add('EMITTED', list(nlp.tokenizer.pipe(sorted(self.emitted_companies))))
+        self._company_id = nlp.vocab.strings.add('COMPANY')
+        # Identifies the word lists in result cache keys
+        digest = hashlib.sha256()
+        for names in (self.companies, self.emitted_companies):
+            digest.update('\n'.join(sorted(names)).encode('utf-8') + b'\0')
+        self.fingerprint = digest.hexdigest()[:12]
+        self.sentences = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self.nlp = nlp.__class__(vocab=nlp.vocab, max_length=nlp.max_length)
+        self.nlp.tokenizer = nlp.tokenizer
+        if 'sentencizer' in nlp.pipe_names:
+            self.nlp.add_pipe('sentencizer', source=nlp)
+        else:
+            self.nlp.add_pipe('sentencizer')
+        component = self.nlp.add_pipe('sentence_prefilter')
+        component.prefilter = self
+        component.ner = nlp.get_pipe('ner')
+
+    def __getstate__(self):
+        # Pickled into the nlp.pipe workers under spawn; counting stays in the parent
+        state = dict(self.__dict__, counter=None)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def match(self, doc):
+        """Return non-overlapping spans of the known companies in ``doc``.
+
+        Gazetteer matches are labelled COMPANY, model-emitted names EMITTED.
+        """
+        return filter_spans([Span(doc, start, end, label) for label, start, end in self.matcher(doc)])
+
+    def record(self, sentences, skipped):
+        with self._lock:
+            self.sentences += sentences
+            self.skipped += skipped
+        if self.counter is not None:
+            self.counter.inc(sentences - skipped, result='passed')
+            self.counter.inc(skipped, result='skipped')
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sentences': self.sentences,
+                'skipped': self.skipped,
+                'skip_rate': self.skipped / self.sentences if self.sentences else 0.0,
+                'companies': len(self.companies),
+                'emitted_companies': len(self.emitted_companies),
+            }
+
+    def pipe(self, texts, batch_size=4, n_process=1):
+        """Like ``nlp.pipe``, but only passing sentences are run through NER."""
+        for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            self.record(*doc.user_data.pop('prefilter', (0, 0)))
+            yield doc
+
+    def annotate(self, doc, ner, batch_size=256):
+        """Set the entities of the passing sentences of ``doc``, run through ``ner`` one by one.
+
+        ``doc`` must be sentence-segmented and not yet through NER. The
+        sentence and skip counts are left in ``doc.user_data['prefilter']``.
+        """
+        companies = self.match(doc)
+        text = doc.text
+        i = 0
+        sentences = 0
+        passing = []
+        for sent in doc.sents:
+            sentences += 1
+            spans = []
+            while i < len(companies) and companies[i].start < sent.end:
+                if companies[i].end <= sent.end:
+                    spans.append(companies[i])
+                i += 1
+            if not spans and not _DIGIT.search(text, sent.start_char, sent.end_char):
+                continue
+            # Span.as_doc copies the whole chunk's token array, so rebuild from words
+            sent_doc = Doc(doc.vocab, words=[token.text for token in sent],
+                           spaces=[bool(token.whitespace_) for token in sent])
+            preset = [span for span in spans if span.label == self._company_id]
+            if preset:
+                # Preset gazetteer companies; other tokens stay unset so the model still labels them
+                sent_doc.set_ents([Span(sent_doc, span.start - sent.start, span.end - sent.start, 'COMPANY')
+                                   for span in preset], default='unmodified')
+            passing.append((sent.start, sent_doc))
+        ents = []
+        # The sentence docs are annotated in place
+        for _ in ner.pipe((sent_doc for _, sent_doc in passing), batch_size=batch_size):
+            pass
+        for offset, sent_doc in passing:
+            ents.extend(Span(doc, offset + ent.start, offset + ent.end, ent.label) for ent in sent_doc.ents)
+        # Skipped sentences keep no entities, the same groups full NER gives them
+        doc.set_ents(ents)
+        doc.user_data['prefilter'] = (sentences, sentences - len(passing))
+        return doc
+
+
+class _PrefilterComponent:
+    """Pipeline component wrapper; ``prefilter`` and ``ner`` are set by SentencePrefilter."""
+
+    def __init__(self):
+        self.prefilter = None
+        self.ner = None
+
+    def __call__(self, doc):
+        return self.prefilter.annotate(doc, self.ner)
+
+    def pipe(self, docs, batch_size=None):
+        for doc in docs:
+            yield self.prefilter.annotate(doc, self.ner)
+
+
+@Language.factory('sentence_prefilter')
+def make_sentence_prefilter(nlp, name):
+    return _PrefilterComponent()
+
+
+_prefilter_lock = threading.Lock()
+
+
+def prefilter_for(model, gazetteer_path, counter=None):
+    """The SentencePrefilter of a model_manager.LoadedModel, built on first use."""
+    if model.prefilter is None:
+        with _prefilter_lock:
+            if model.prefilter is None:
+                companies = []
+                if gazetteer_path and os.path.exists(gazetteer_path):
+                    companies = load_gazetteer(gazetteer_path)
+                elif gazetteer_path:
+                    logger.warning('Gazetteer %s not found; pre-filter starts with no known companies', gazetteer_path)
+                emitted = model.nlp.meta.get('emitted_companies', [])
+                model.prefilter = SentencePrefilter(model.nlp, companies, emitted, counter=counter)
+    return model.prefilter
@@ -0,0 +1,196 @@
+"""Content-addressed cache for extraction results.
+
+Entries are keyed by a hash of the normalized input plus the model version,
+so changing labels or re-uploading the same file never re-runs the model.
+An in-memory LRU tier, bounded by entry count and by the JSON size of its
+values, sits in front of an optional on-disk tier that is evicted
+oldest-first once it grows past ``disk_max_bytes``.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFC', text)
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+def model_version(model_dir):
+    """Version string for the model in ``model_dir``: its meta.json name and
+    version plus a hash of every file, so retrained weights always get a new
+    version even when meta.json comes out byte-identical."""
+    model_dir = os.path.realpath(model_dir)
+    with open(os.path.join(model_dir, 'meta.json'), 'rb') as f:
+        meta = json.load(f)
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(model_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, model_dir).encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+            digest.update(b'\0')
+    return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}+{digest.hexdigest()[:12]}"
+
+
+def extraction_version(version, **config):
+    """``version`` extended with a fingerprint of the extraction settings the
+    output depends on (pre-filter, gazetteer, fast paths), for cache keys."""
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8'))
+    return f'{version}/{digest.hexdigest()[:12]}'
+
+
+def text_key(text, version):
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8'))
+    digest.update(b'\0' + version.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def file_key(data, ext, version):
+    digest = hashlib.sha256(data)
+    digest.update(b'\0' + ext.encode('utf-8') + b'\0' + version.encode('utf-8'))
+    return 'file-' + digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=256, disk_dir=None, disk_max_bytes=512 * 1024 * 1024,
+                 memory_max_bytes=128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        # key -> (value, size of its JSON encoding)
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key + '.json')
+
+    def _remember(self, key, value, size):
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        if size > self.memory_max_bytes:
+            return
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.memory_max_bytes:
+            self._memory_bytes -= self._memory.popitem(last=False)[1][1]
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key][0]
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = f.read()
+                value = json.loads(data)
+                os.utime(path)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, value, len(data))
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        data = json.dumps(value)
+        with self._lock:
+            self._remember(key, value, len(data))
+        if self.disk_dir:
+            try:
+                self._write_disk(key, data)
+            except OSError:
+                # Disk full or unwritable: the entry is only kept in memory
+                logger.warning('Could not write result cache entry %s to %s', key, self.disk_dir, exc_info=True)
+
+    def _write_disk(self, key, data):
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._disk_bytes += len(data.encode('utf-8')) - replaced
+            over = self._disk_bytes > self.disk_max_bytes
+        if over:
+            self._evict_disk()
+
+    def _disk_entries(self):
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict_disk(self):
+        # Only runs once the running total is over budget; the scan also
+        # corrects the total for entries written by other processes
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        # Free down to 90% so the next few puts do not rescan
+        target = self.disk_max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_bytes': self._disk_bytes,
+            }
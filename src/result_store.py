@@ -0,0 +1,129 @@
+"""Server-side storage of extraction results for paginated viewing and export.
+
+Each result lives in ``<root>/<result_id>/``: the groups as JSON Lines, the
+raw text, and a small meta.json with the label set, the group count and the
+byte offset of every ``INDEX_STRIDE``-th line so a page can be read with a
+single seek instead of scanning from the top.
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from itertools import islice
+
+INDEX_STRIDE = 1000
+_RESULT_ID = re.compile(r'^[0-9a-f]{16,64}$')
+
+
+class ResultStore:
+    def __init__(self, root, max_results=1000):
+        self.root = root
+        self.max_results = max_results
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, result_id, name=''):
+        if not _RESULT_ID.match(result_id):
+            raise KeyError(result_id)
+        return os.path.join(self.root, result_id, name)
+
+    def exists(self, result_id):
+        try:
+            return os.path.isfile(self._path(result_id, 'meta.json'))
+        except KeyError:
+            return False
+
+    def save(self, result_id, text, groups):
+        """Store a result unless it is already there; ids are content hashes.
+
+        ``text`` is a string or an iterable of strings written as they come.
+        """
+        if self.exists(result_id):
+            os.utime(self._path(result_id))
+            return
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.root)
+        try:
+            labels = set()
+            offsets = []
+            with open(os.path.join(tmp_dir, 'groups.jsonl'), 'wb') as f:
+                for i, group in enumerate(groups):
+                    if i % INDEX_STRIDE == 0:
+                        offsets.append(f.tell())
+                    labels.update(group)
+                    f.write(json.dumps(group).encode('utf-8') + b'\n')
+            raw_chars = 0
+            with open(os.path.join(tmp_dir, 'raw.txt'), 'w', encoding='utf-8') as f:
+                for chunk in ([text] if isinstance(text, str) else text):
+                    f.write(chunk)
+                    raw_chars += len(chunk)
+            meta = {
+                'count': len(groups),
+                'labels': sorted(labels),
+                'raw_chars': raw_chars,
+                'offsets': offsets,
+                'created_at': time.time(),
+            }
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.rename(tmp_dir, self._path(result_id))
+        except OSError:
+            # Lost a race with an identical upload, or the disk is full
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not self.exists(result_id):
+                raise
+        self._prune()
+
+    def _prune(self):
+        entries = [entry for entry in os.scandir(self.root) if entry.is_dir() and not entry.name.startswith('.')]
+        if len(entries) <= self.max_results:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_results]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def meta(self, result_id):
+        with open(self._path(result_id, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def iter_groups(self, result_id, start=0, stop=None, meta=None):
+        """Return an iterator over groups ``start`` to ``stop`` without loading the rest.
+
+        The file is opened before returning, so a missing result raises
+        OSError here rather than in the middle of a streamed response.
+        """
+        meta = meta or self.meta(result_id)
+        f = open(self._path(result_id, 'groups.jsonl'), 'rb')
+        return self._iter_lines(f, meta, start, stop)
+
+    def _iter_lines(self, f, meta, start, stop):
+        with f:
+            block = min(start // INDEX_STRIDE, max(len(meta['offsets']) - 1, 0))
+            if meta['offsets']:
+                f.seek(meta['offsets'][block])
+            skip = start - block * INDEX_STRIDE
+            limit = None if stop is None else stop - block * INDEX_STRIDE
+            for line in islice(f, skip, limit):
+                yield json.loads(line)
+
+    def page(self, result_id, page, per_page, meta=None):
+        start = (page - 1) * per_page
+        return list(self.iter_groups(result_id, start, start + per_page, meta=meta))
+
+    def raw_preview(self, result_id, max_chars):
+        with open(self._path(result_id, 'raw.txt'), encoding='utf-8') as f:
+            return f.read(max_chars)
+
+    def iter_raw(self, result_id, chunk_chars=64 * 1024):
+        """Return an iterator over the raw text; opened eagerly like iter_groups."""
+        f = open(self._path(result_id, 'raw.txt'), encoding='utf-8')
+        return self._iter_chunks(f, chunk_chars)
+
+    @staticmethod
+    def _iter_chunks(f, chunk_chars):
+        with f:
+            while True:
+                chunk = f.read(chunk_chars)
+                if not chunk:
+                    return
+                yield chunk
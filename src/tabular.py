@@ -0,0 +1,75 @@
+"""Structured extraction for CSV/XLS(X) uploads without running the model.
+
+Spreadsheet headers already name the entities, so each column is mapped to a
+label with the same convention as the training-data generators and the rows
+become COMPANY groups directly.
+"""
+import pandas as pd
+
+TABULAR_EXTENSIONS = {'csv', 'xls', 'xlsx'}
+
+
+def column_label(col):
+    return str(col).strip().upper().replace(' ', '_')
+
+
+def read_table(filepath, ext):
+    if ext == 'csv':
+        return pd.read_csv(filepath)
+    return pd.read_excel(filepath)
+
+
+def extract_grouped_from_dataframe(df, known_labels=None):
+    """Build the same groups as ``extract_financial_entities_grouped`` from ``df``.
+
+    Returns None when ``known_labels`` is given and no header maps to COMPANY
+    (or COMPANY is not one of them): without a company column, companies can
+    only be named in free text, e.g. a Notes column, which needs the model.
+    """
+    labels = [column_label(col) for col in df.columns]
+    if known_labels is not None and ('COMPANY' not in known_labels or 'COMPANY' not in labels):
+        return None
+    table = df.set_axis(labels, axis=1)
+    table = table.loc[:, ~table.columns.duplicated()].copy()
+    columns = ['COMPANY'] + [label for label in table.columns if label != 'COMPANY']
+    numeric = {label: pd.api.types.is_numeric_dtype(table[label]) for label in table.columns}
+    # Strip text cells (blank ones become missing) so de-duplication sees what the groups will hold
+    for label in table.columns:
+        if not numeric[label]:
+            column = table[label]
+            strings = column.astype(str).str.strip()
+            table[label] = strings.mask(column.isna() | (strings == ''))
+    # De-duplicate on the typed values, then stringify only the unique rows
+    table = table.reindex(columns=columns).drop_duplicates()
+    data = {}
+    for label in columns:
+        column = table[label]
+        if numeric.get(label):
+            # numpy's shortest repr matches str() and is far cheaper than pandas' astype(str)
+            values = column.to_numpy().astype(str).astype(object)
+        else:
+            values = column.to_numpy(dtype=object, copy=True)
+        values[column.isna().to_numpy()] = None
+        data[label] = values
+    data['COMPANY'][pd.isna(data['COMPANY'])] = 'Unknown'
+    # A second pass for rows that only became equal once the missing company read 'Unknown'
+    frame = pd.DataFrame(data, columns=columns, copy=False).drop_duplicates()
+    # Present values are all strings; anything else is a missing cell (None or NaN)
+    return [{label: value for label, value in record.items() if isinstance(value, str)}
+            for record in frame.to_dict('records')]
+
+
+def iter_table_csv(df, rows_per_chunk=10_000):
+    """The table as CSV text (as ``df.to_csv(index=False)``), a block of rows at a time."""
+    for start in range(0, max(len(df), 1), rows_per_chunk):
+        yield df.iloc[start:start + rows_per_chunk].to_csv(index=False, header=start == 0)
+
+
+def extract_grouped_from_table(filepath, ext, known_labels=None):
+    """Return (df, groups) for a spreadsheet; groups is None if NER is needed.
+
+    The raw text is left to the caller (``iter_table_csv``), so the fast path
+    does not pay for a full CSV render up front.
+    """
+    df = read_table(filepath, ext)
+    return df, extract_grouped_from_dataframe(df, known_labels)
@@ -0,0 +1,138 @@
+"""Plain-text extraction for the supported upload types."""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Pages handed to a worker per task; each task re-opens the PDF once.
+PDF_PAGES_PER_TASK = 4
+# Pages extracted ahead of the consumer. Memory is bounded by this window.
+PDF_PAGE_WINDOW = 32
+
+_pdf_pools = {}
+_pdf_pools_lock = threading.Lock()
+
+
+def default_start_method():
+    # Not fork: the app process already runs model, reload and request threads
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def _get_pdf_pool(n_process):
+    with _pdf_pools_lock:
+        if n_process not in _pdf_pools:
+            _pdf_pools[n_process] = ProcessPoolExecutor(
+                max_workers=n_process, mp_context=multiprocessing.get_context(default_start_method()))
+        return _pdf_pools[n_process]
+
+
+@atexit.register
+def shutdown_pdf_pools():
+    with _pdf_pools_lock:
+        pools = list(_pdf_pools.values())
+        _pdf_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pdf_page_range(filepath, start, stop):
+    """Return (text, seconds) for pages ``start`` to ``stop`` of the PDF."""
+    results = []
+    with pdfplumber.open(filepath) as pdf:
+        for page in pdf.pages[start:stop]:
+            began = time.perf_counter()
+            page_text = page.extract_text() or ''
+            page.close()
+            results.append((page_text, time.perf_counter() - began))
+    return results
+
+
+def iter_pdf_pages(filepath, n_process=1, window=PDF_PAGE_WINDOW, progress=None):
+    """Yield the text of each PDF page in order, as soon as it is available.
+
+    With ``n_process`` > 1 pages are fanned out to a process pool, keeping at
+    most ``window`` pages in flight. ``progress`` is called after every page
+    with (page_number, page_count, seconds).
+    """
+    began = time.perf_counter()
+    with pdfplumber.open(filepath) as pdf:
+        page_count = len(pdf.pages)
+    ranges = [(start, min(start + PDF_PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+    if n_process > 1 and len(ranges) > 1:
+        pool = _get_pdf_pool(n_process)
+        max_tasks = max(1, window // PDF_PAGES_PER_TASK)
+        pending = deque()
+        next_range = iter(ranges)
+
+        def fill():
+            while len(pending) < max_tasks:
+                page_range = next(next_range, None)
+                if page_range is None:
+                    return
+                pending.append(pool.submit(_extract_pdf_page_range, filepath, *page_range))
+
+        def batches():
+            fill()
+            while pending:
+                results = pending.popleft().result()
+                fill()
+                yield results
+    else:
+        def batches():
+            for page_range in ranges:
+                yield _extract_pdf_page_range(filepath, *page_range)
+
+    page_number = 0
+    for results in batches():
+        for page_text, seconds in results:
+            page_number += 1
+            if progress is not None:
+                progress(page_number, page_count, seconds)
+            logger.debug('PDF page %d/%d extracted in %.3fs', page_number, page_count, seconds)
+            yield page_text
+    elapsed = time.perf_counter() - began
+    logger.info('Extracted %d PDF pages from %s in %.2fs (%.1f pages/s)', page_count,
+                os.path.basename(filepath), elapsed, page_count / elapsed if elapsed else 0.0)
+
+
+def extract_text_from_pdf(filepath, n_process=1):
+    return ''.join(page_text + '\n' for page_text in iter_pdf_pages(filepath, n_process) if page_text)
+
+def extract_text_from_xls(filepath):
+    df_file = pd.read_excel(filepath)
+    return df_file.to_csv(index=False)
+
+def extract_text_from_csv(filepath):
+    df_file = pd.read_csv(filepath)
+    return df_file.to_csv(index=False)
+
+def iter_text_from_file(filepath, ext, n_process=1, progress=None):
+    """Yield the text of a file in pieces; PDFs stream page by page."""
+    if ext == 'pdf':
+        for page_text in iter_pdf_pages(filepath, n_process, progress=progress):
+            if page_text:
+                yield page_text + '\n'
+    else:
+        yield extract_text_from_file(filepath, ext)
+
+def extract_text_from_file(filepath, ext):
+    if ext == 'pdf':
+        return extract_text_from_pdf(filepath)
+    elif ext in ['xls', 'xlsx']:
+        return extract_text_from_xls(filepath)
+    elif ext == 'csv':
+        return extract_text_from_csv(filepath)
+    elif ext == 'txt':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+    return ''
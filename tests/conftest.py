@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+MODEL_DIR = os.path.join(ROOT_DIR, 'custom_financial_ner')
+
+
+@pytest.fixture(scope='session')
+def nlp():
+    from model_manager import load_pipeline
+
+    nlp, _ = load_pipeline(MODEL_DIR)
+    return nlp
@@ -0,0 +1,67 @@
+"""Chunked extraction against a single ``nlp()`` call over the whole text."""
+import random
+
+import pytest
+
+from extraction import dedupe_groups, extract_grouped, iter_chunks, iter_doc_groups
+
+COMPANIES = ['AAPL', 'MSFT', 'GOOG', 'AMZN', 'BCS', 'NVDA']
+SENTENCES = [
+    'The ROE for {company} in {year} was {value} percent.',
+    '{company} reported a revenue of {value} crore for the year {year}.',
+    'Forward-looking statements involve risks and uncertainties.',
+    'This section describes our governance practices.',
+    'The board reviewed the report and approved the accounts.',
+]
+
+
+def synthesize_text(size, separator, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(SENTENCES).format(
+            company=rng.choice(COMPANIES), year=rng.randint(2009, 2023),
+            value=f'{rng.uniform(1, 50000):.2f}')
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return separator.join(sentences)
+
+
+def group_keys(groups):
+    return {tuple(sorted(group.items())) for group in groups}
+
+
+def single_call_groups(nlp, text):
+    return list(dedupe_groups(iter_doc_groups(nlp(text))))
+
+
+@pytest.mark.parametrize('separator', ['\n', ' '], ids=['newlines', 'single_line'])
+def test_chunks_rejoin_to_the_text(separator):
+    text = synthesize_text(50_000, separator)
+    chunks = list(iter_chunks([text], 3000))
+    assert ''.join(chunks) == text
+    assert all(len(chunk) <= 3000 for chunk in chunks)
+    # Chunks start at a sentence, not on the space after the previous one
+    assert all(not chunk[0].isspace() for chunk in chunks[1:] if separator == ' ')
+
+
+@pytest.mark.parametrize('separator', ['\n', ' '], ids=['newlines', 'single_line'])
+def test_chunked_matches_single_call(nlp, separator):
+    text = synthesize_text(50_000, separator)
+    expected = single_call_groups(nlp, text)
+    assert group_keys(extract_grouped(nlp, text, chunk_chars=3000)) == group_keys(expected)
+
+
+def test_pages_match_one_string(nlp):
+    text = synthesize_text(20_000, '\n')
+    lines = text.splitlines(keepends=True)
+    pages = [''.join(lines[i:i + 40]) for i in range(0, len(lines), 40)]
+    assert extract_grouped(nlp, pages, chunk_chars=3000) == extract_grouped(nlp, text, chunk_chars=3000)
+
+
+def test_sentence_longer_than_chunk_is_split_on_whitespace():
+    text = ' '.join(['word'] * 100)
+    chunks = list(iter_chunks([text], 50))
+    assert ''.join(chunks) == text
+    assert all(len(chunk) <= 50 and not chunk[0].isspace() for chunk in chunks)
@@ -1,46 +1,282 @@
-import spacy
-from spacy.training.example import Example
-from spacy.util import minibatch, compounding
+"""Train the custom financial NER model from DocBin corpora.
+
+Training examples are streamed from the ``.spacy`` shards written by
+training_data.py every epoch: shard order is shuffled and examples pass
+through a shuffle buffer, so memory holds one shard, the buffer and the dev
+set (at most ``--max-dev-examples``), whatever the corpus size. After each
+epoch the model is scored on the dev set and the best checkpoint so far is
+written to a staging directory under ``OUTPUT_DIR.versions/``. Only at the
+end of the run is that checkpoint promoted, and only if its dev F-score beats
+the live model's: it becomes ``OUTPUT_DIR.versions/<time>`` and OUTPUT_DIR,
+a symlink, is switched to it atomically, so the app never hot-reloads a
+half-trained or worse model.
+
+OUTPUT_DIR defaults to ``models/custom_financial_ner``, which is not tracked
+by git. The model checked into the repo at ``custom_financial_ner/`` is never
+replaced; it is the baseline the first trained model has to beat, and the
+model the app serves until a trained one exists.
+
+Usage:
+    python training_data.py --output corpus
+    python train_spacy_ner.py --train corpus/train --dev corpus/dev
+"""
+import argparse
+import os
 import random
 import shutil
-from spacy_train_data import TRAIN_DATA
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from itertools import islice
+
+import spacy
+from spacy.training import Corpus, Example
+from spacy.training.corpus import walk_corpus
+from spacy.util import minibatch
+from thinc.api import compounding, fix_random_seed
+
+from training_data import shuffled
 
 # Set your model output directory
-OUTPUT_DIR = "custom_financial_ner"
+OUTPUT_DIR = "models/custom_financial_ner"
+# Model checked into the repo, served until OUTPUT_DIR exists
+BASELINE_DIR = "custom_financial_ner"
 
-# Delete old model if exists
-import os
-if os.path.exists(OUTPUT_DIR):
-    shutil.rmtree(OUTPUT_DIR)
-
-# Create blank English model
-nlp = spacy.blank("en")
-
-# Add NER pipeline if not present
-if "ner" not in nlp.pipe_names:
-    ner = nlp.add_pipe("ner")
-else:
-    ner = nlp.get_pipe("ner")
-
-# Add all labels from training data
-for _, annotations in TRAIN_DATA:
-    for ent in annotations.get("entities"):
-        ner.add_label(ent[2])
-
-# Disable other pipes for training
-other_pipes = [pipe for pipe in nlp.pipe_names if pipe != "ner"]
-with nlp.disable_pipes(*other_pipes):
-    optimizer = nlp.begin_training()
-    for itn in range(20):
-        random.shuffle(TRAIN_DATA)
-        losses = {}
-        batches = minibatch(TRAIN_DATA, size=compounding(4.0, 32.0, 1.5))
-        for batch in batches:
-            texts, annotations = zip(*batch)
-            examples = [Example.from_dict(nlp.make_doc(text), ann) for text, ann in batch]
-            nlp.update(examples, drop=0.2, losses=losses)
-        print(f"Iteration {itn+1}, Losses: {losses}")
-
-# Save the trained model
-nlp.to_disk(OUTPUT_DIR)
-print(f"Model saved to {OUTPUT_DIR}")
+
+def iter_examples(nlp, path, rng=None):
+    """Stream Examples from the DocBin file(s) at ``path``, one shard at a time.
+
+    With ``rng``, the shard order is shuffled.
+    """
+    if not path or not os.path.exists(path):
+        return
+    shards = walk_corpus(path, '.spacy')
+    if rng is not None:
+        rng.shuffle(shards)
+    for shard in shards:
+        yield from Corpus(shard)(nlp)
+
+
+def is_held_out(example, dev_fraction):
+    """Stable train/dev split by text hash, the same in every epoch."""
+    return zlib.crc32(example.reference.text.encode('utf-8')) % 10_000 < dev_fraction * 10_000
+
+
+def _versions_dir(output_dir):
+    return os.path.abspath(output_dir) + '.versions'
+
+
+def promote(staging_dir, output_dir, keep=3):
+    """Move a staged model to ``OUTPUT_DIR.versions/<time>`` and point the
+    ``output_dir`` symlink at it with a single ``os.replace``, so a model is
+    always there. The previously live version is never pruned."""
+    output_dir = os.path.abspath(output_dir)
+    versions_dir = _versions_dir(output_dir)
+    check_output_dir(output_dir)
+    previous_dir = os.path.realpath(output_dir) if os.path.lexists(output_dir) else None
+    # Names sort chronologically: newest last
+    version_dir = os.path.join(versions_dir, datetime.now().strftime('%Y%m%d-%H%M%S-%f'))
+    os.rename(staging_dir, version_dir)
+    try:
+        tmp_link = f'{output_dir}.{os.getpid()}.link'
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        os.symlink(os.path.relpath(version_dir, os.path.dirname(output_dir)), tmp_link)
+        os.replace(tmp_link, output_dir)
+    except BaseException:
+        restore_model(output_dir)
+        raise
+    _prune_versions(versions_dir, [version_dir, previous_dir], keep)
+    return version_dir
+
+
+def check_output_dir(output_dir):
+    """Refuse to replace a plain directory, e.g. the model tracked in git, with a symlink."""
+    if os.path.isdir(output_dir) and not os.path.islink(output_dir):
+        raise ValueError(f'{output_dir} is a plain directory, not a model symlink written by this '
+                         f'script; pass another --output, or move it away first.')
+
+
+def _iter_versions(versions_dir):
+    """Version directories holding a model, newest first."""
+    if not os.path.isdir(versions_dir):
+        return []
+    paths = []
+    for name in sorted(os.listdir(versions_dir), reverse=True):
+        if name.startswith('.'):
+            continue  # staging
+        path = os.path.join(versions_dir, name)
+        if os.path.isfile(os.path.join(path, 'meta.json')):
+            paths.append(path)
+    return paths
+
+
+def _prune_versions(versions_dir, protected_dirs, keep):
+    """Remove all but the ``keep`` newest versions, never one in ``protected_dirs``."""
+    protected_dirs = [path for path in protected_dirs if path]
+    kept = 0
+    for name in sorted(os.listdir(versions_dir), reverse=True):
+        if name.startswith('.'):
+            continue  # staging, possibly of a run still in progress
+        path = os.path.join(versions_dir, name)
+        if any(os.path.commonpath([path, protected]) == path for protected in protected_dirs):
+            continue
+        if kept < keep:
+            kept += 1
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def restore_model(output_dir):
+    """Point ``output_dir`` back at the newest saved version if it is missing,
+    e.g. after a crash in the middle of the first swap."""
+    output_dir = os.path.abspath(output_dir)
+    if os.path.exists(output_dir):
+        return False
+    versions = _iter_versions(_versions_dir(output_dir))
+    if not versions:
+        return False
+    if os.path.lexists(output_dir):
+        os.remove(output_dir)  # dangling symlink
+    os.symlink(os.path.relpath(versions[0], os.path.dirname(output_dir)), output_dir)
+    print(f"Restored {output_dir} from {versions[0]}")
+    return True
+
+
+def live_score(output_dir, dev_examples):
+    """Dev F-score of the model currently at ``output_dir``, or None without one.
+
+    The score recorded in its meta is used when there is one; older models
+    without it are evaluated on ``dev_examples``.
+    """
+    if not os.path.isfile(os.path.join(output_dir, 'meta.json')):
+        return None
+    live = spacy.load(output_dir)
+    performance = live.meta.get('performance') or {}
+    if 'ents_f' in performance:
+        return performance['ents_f'] or 0.0
+    examples = [Example(live.make_doc(example.reference.text), example.reference) for example in dev_examples]
+    return live.evaluate(examples).get('ents_f') or 0.0
+
+
+def emitted_companies(nlp, examples):
+    """COMPANY names the model predicts on ``examples``, for the NER pre-filter."""
+    names = set()
+    for doc in nlp.pipe(example.reference.text for example in examples):
+        names.update(ent.text.strip() for ent in doc.ents if ent.label_ == 'COMPANY')
+    return sorted(names - {''})
+
+
+def train(train_path, dev_path=None, output_dir=OUTPUT_DIR, max_epochs=20, patience=3,
+          dropout=0.2, dev_fraction=0.1, seed=0, baseline_dir=BASELINE_DIR, max_dev_examples=20_000,
+          shuffle_buffer=10_000, init_examples=2_000):
+    fix_random_seed(seed)
+    rng = random.Random(seed)
+    check_output_dir(output_dir)
+    restore_model(output_dir)
+
+    # Create blank English model
+    nlp = spacy.blank("en")
+    nlp.add_pipe("ner")
+
+    began = time.perf_counter()
+    if next(iter_examples(nlp, train_path), None) is None:
+        raise ValueError(f'No training examples found at {train_path!r}.')
+    has_dev = next(iter_examples(nlp, dev_path), None) is not None
+    if has_dev:
+        dev_examples = list(islice(iter_examples(nlp, dev_path), max_dev_examples))
+    else:
+        # No separate dev corpus: hold out part of the training data
+        dev_examples = list(islice((example for example in iter_examples(nlp, train_path)
+                                    if is_held_out(example, dev_fraction)), max_dev_examples))
+    if not dev_examples:
+        raise ValueError('No dev examples: pass --dev or raise --dev-fraction.')
+
+    def train_examples():
+        examples = iter_examples(nlp, train_path, rng)
+        if not has_dev:
+            examples = (example for example in examples if not is_held_out(example, dev_fraction))
+        return shuffled(examples, rng, shuffle_buffer)
+
+    print(f"Loaded {len(dev_examples)} dev examples in {time.perf_counter() - began:.1f}s")
+
+    # Labels are inferred from a sample of the training examples
+    optimizer = nlp.initialize(lambda: islice(train_examples(), init_examples))
+
+    versions_dir = _versions_dir(output_dir)
+    os.makedirs(versions_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=versions_dir)
+    try:
+        best_score = None
+        best_epoch = 0
+        for epoch in range(1, max_epochs + 1):
+            epoch_began = time.perf_counter()
+            losses = {}
+            examples = words = 0
+            for batch in minibatch(train_examples(), size=compounding(4.0, 32.0, 1.5)):
+                examples += len(batch)
+                words += sum(len(example.reference) for example in batch)
+                nlp.update(batch, drop=dropout, sgd=optimizer, losses=losses)
+            train_seconds = time.perf_counter() - epoch_began
+            with nlp.use_params(optimizer.averages):
+                scores = nlp.evaluate(dev_examples)
+            score = scores.get('ents_f') or 0.0
+            epoch_seconds = time.perf_counter() - epoch_began
+            losses = {name: round(float(loss), 3) for name, loss in losses.items()}
+            print(f"Epoch {epoch}, {examples} examples, Losses: {losses}, "
+                  f"P/R/F: {scores.get('ents_p') or 0.0:.3f}/{scores.get('ents_r') or 0.0:.3f}/{score:.3f}, "
+                  f"{words / train_seconds:.0f} words/s, {epoch_seconds:.1f}s")
+
+            if best_score is None or score > best_score:
+                best_score = score
+                best_epoch = epoch
+                nlp.meta['performance'] = {key: scores[key] for key in ('ents_p', 'ents_r', 'ents_f')
+                                           if key in scores}
+                with nlp.use_params(optimizer.averages):
+                    nlp.meta['emitted_companies'] = emitted_companies(nlp, dev_examples)
+                    # Checkpoint only; nothing is served from staging
+                    nlp.to_disk(staging_dir)
+                print(f"New best checkpoint at epoch {epoch}")
+            elif epoch - best_epoch >= patience:
+                print(f"No improvement for {patience} epochs, stopping early")
+                break
+
+        print(f"Best dev F-score {best_score:.3f} at epoch {best_epoch}; "
+              f"total {time.perf_counter() - began:.1f}s")
+        live_dir = output_dir if os.path.exists(output_dir) else baseline_dir
+        current = live_score(live_dir, dev_examples) if live_dir else None
+        if current is not None and best_score <= current:
+            print(f"Live model at {live_dir} scores {current:.3f}; keeping it")
+            return best_score
+        promote(staging_dir, output_dir)
+        print(f"Promoted the epoch {best_epoch} model to {output_dir}")
+        return best_score
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train the custom financial NER model.')
+    parser.add_argument('--train', default='corpus/train', help='DocBin file or directory of shards')
+    parser.add_argument('--dev', default='corpus/dev', help='held-out DocBin file or directory')
+    parser.add_argument('--output', default=OUTPUT_DIR)
+    parser.add_argument('--max-epochs', type=int, default=20)
+    parser.add_argument('--patience', type=int, default=3)
+    parser.add_argument('--dropout', type=float, default=0.2)
+    parser.add_argument('--baseline', default=BASELINE_DIR,
+                        help='model to beat while --output has none yet')
+    parser.add_argument('--dev-fraction', type=float, default=0.1,
+                        help='share of train held out when there is no dev corpus')
+    parser.add_argument('--max-dev-examples', type=int, default=20_000,
+                        help='dev examples kept in memory for scoring')
+    parser.add_argument('--shuffle-buffer', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    train(args.train, args.dev, args.output, max_epochs=args.max_epochs, patience=args.patience,
+          dropout=args.dropout, dev_fraction=args.dev_fraction, seed=args.seed, baseline_dir=args.baseline,
+          max_dev_examples=args.max_dev_examples, shuffle_buffer=args.shuffle_buffer)
+
+
+if __name__ == '__main__':
+    main()
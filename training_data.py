@@ -0,0 +1,253 @@
+"""Streaming spaCy NER training-data generation from a statements table.
+
+Rows are read in chunks, turned into examples whose entity offsets are
+recorded while the text is being built, and written to sharded ``.spacy``
+DocBin files under ``<output>/train`` and ``<output>/dev``. The same seed
+always produces the same corpus.
+
+Usage:
+    python training_data.py --mode natural --output corpus --seed 0
+"""
+import argparse
+import os
+import random
+import string
+import time
+
+import pandas as pd
+import spacy
+from spacy.tokens import DocBin
+
+DATASET_PATH = 'Financial Statements.csv'
+
+# Natural templates for financial sentences
+NATURAL_TEMPLATES = [
+    "{Company} reported a revenue of {Revenue} crore for the year {Year}.",
+    "The net income of {Company} in {Year} was {Net income} crore.",
+    "{Company} had assets totaling {Assets} crore and liabilities of {Liabilities} crore.",
+    "In {Year}, {Company} paid a dividend of {Dividend} per share.",
+    "The EBITDA for {Company} stood at {Ebitda} crore.",
+    "{Company}'s earnings per share (EPS) in {Year} was {Eps}.",
+    "{Company} reported total expenses of {Expenses} crore in {Year}.",
+    "{Company} had a cash flow of {Cash flow} crore and a loss of {Loss} crore.",
+    "The ROE for {Company} in {Year} was {ROE} percent.",
+]
+
+
+def entity_label(col):
+    return col.upper().replace(' ', '_')
+
+
+def iter_dataset(path=DATASET_PATH, chunksize=100_000):
+    """Yield the dataset as DataFrame chunks with stripped column names."""
+    if path.endswith('.csv'):
+        chunks = pd.read_csv(path, encoding='utf-8-sig', chunksize=chunksize)
+    elif path.endswith('.xlsx'):
+        df = pd.read_excel(path, engine='openpyxl')
+        chunks = (df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+    elif path.endswith('.xls'):
+        df = pd.read_excel(path, engine='xlrd')
+        chunks = (df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+    else:
+        raise ValueError('Unsupported file format for dataset!')
+    for chunk in chunks:
+        chunk.columns = [col.strip() for col in chunk.columns]
+        yield chunk
+
+
+def iter_rows(chunks):
+    """Yield each row as a dict of column -> str(value), without missing cells."""
+    for chunk in chunks:
+        columns = list(chunk.columns)
+        present = chunk.notna().to_numpy().tolist()
+        values = zip(*(chunk[col].tolist() for col in columns))
+        for row_present, row_values in zip(present, values):
+            yield {col: str(value) for col, ok, value in zip(columns, row_present, row_values) if ok}
+
+
+def compile_template(template):
+    """Split a template into (literal, field) pairs; field is None at the end."""
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+
+def fill_template(parts, row):
+    """Fill a compiled template, returning (text, entities) or None if a field is missing."""
+    pieces = []
+    entities = []
+    offset = 0
+    for literal, field in parts:
+        pieces.append(literal)
+        offset += len(literal)
+        if field is None:
+            continue
+        value = row.get(field)
+        if value is None:
+            return None
+        pieces.append(value)
+        entities.append((offset, offset + len(value), entity_label(field)))
+        offset += len(value)
+    return ''.join(pieces), entities
+
+
+def iter_structured_examples(rows):
+    """One "Column: value; ..." example per row, every column an entity."""
+    for row in rows:
+        pieces = []
+        entities = []
+        offset = 0
+        for col, value in row.items():
+            if pieces:
+                pieces.append('; ')
+                offset += 2
+            prefix = f'{col}: '
+            pieces.append(prefix + value)
+            start = offset + len(prefix)
+            entities.append((start, start + len(value), entity_label(col)))
+            offset = start + len(value)
+        if entities:
+            yield ''.join(pieces), {'entities': entities}
+
+
+def iter_natural_examples(rows, rng, templates=NATURAL_TEMPLATES, templates_per_row=3):
+    """Up to ``templates_per_row`` randomly chosen template sentences per row."""
+    compiled = [compile_template(template) for template in templates]
+    k = min(templates_per_row, len(compiled))
+    for row in rows:
+        for parts in rng.sample(compiled, k=k):
+            filled = fill_template(parts, row)
+            if filled is not None and filled[1]:
+                yield filled[0], {'entities': filled[1]}
+
+
+def shuffled(examples, rng, buffer_size=10_000):
+    """Approximate shuffle of a stream using a fixed-size buffer."""
+    buffer = []
+    for example in examples:
+        if len(buffer) < buffer_size:
+            buffer.append(example)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = example
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+class ShardWriter:
+    """Write Docs into numbered DocBin shards of ``shard_size`` docs each.
+
+    Shards left in ``output_dir`` by an earlier run are removed first, so a
+    smaller corpus never picks up stale ones.
+    """
+
+    def __init__(self, output_dir, prefix, shard_size):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.shards = 0
+        self.count = 0
+        self._docbin = None
+        os.makedirs(output_dir, exist_ok=True)
+        for name in os.listdir(output_dir):
+            if name.endswith('.spacy'):
+                os.remove(os.path.join(output_dir, name))
+
+    def add(self, doc):
+        if self._docbin is None:
+            self._docbin = DocBin(attrs=['ENT_IOB', 'ENT_TYPE'])
+        self._docbin.add(doc)
+        self.count += 1
+        if len(self._docbin) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        if self._docbin is not None and len(self._docbin):
+            path = os.path.join(self.output_dir, f'{self.prefix}-{self.shards:05d}.spacy')
+            self._docbin.to_disk(path)
+            self.shards += 1
+        self._docbin = None
+
+
+def write_docbin_shards(examples, output_dir, rng, shard_size=10_000, dev_fraction=0.1,
+                        lang='en', batch_size=1000, report_every=100_000):
+    """Tokenize ``examples`` and stream them into train/dev DocBin shards."""
+    nlp = spacy.blank(lang)
+    writers = {
+        'train': ShardWriter(os.path.join(output_dir, 'train'), 'train', shard_size),
+        'dev': ShardWriter(os.path.join(output_dir, 'dev'), 'dev', shard_size),
+    }
+    skipped = 0
+    began = time.perf_counter()
+    batch = []
+
+    def write(batch):
+        nonlocal skipped
+        docs = nlp.tokenizer.pipe(text for text, _ in batch)
+        for doc, (_, annotations) in zip(docs, batch):
+            spans = []
+            for start, end, label in annotations['entities']:
+                span = doc.char_span(start, end, label=label, alignment_mode='contract')
+                if span is None:
+                    skipped += 1
+                    continue
+                spans.append(span)
+            doc.ents = spans
+            split = 'dev' if rng.random() < dev_fraction else 'train'
+            writers[split].add(doc)
+
+    total = 0
+    for example in examples:
+        batch.append(example)
+        if len(batch) >= batch_size:
+            write(batch)
+            total += len(batch)
+            batch = []
+            if report_every and total % report_every < batch_size:
+                elapsed = time.perf_counter() - began
+                print(f'{total} examples written ({total / elapsed:.0f} examples/s)')
+    if batch:
+        write(batch)
+    for writer in writers.values():
+        writer.flush()
+    return {
+        'train': writers['train'].count,
+        'dev': writers['dev'].count,
+        'shards': writers['train'].shards + writers['dev'].shards,
+        'skipped_entities': skipped,
+        'seconds': time.perf_counter() - began,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate sharded spaCy NER training data.')
+    parser.add_argument('--dataset', default=DATASET_PATH)
+    parser.add_argument('--mode', choices=['natural', 'structured'], default='natural')
+    parser.add_argument('--output', default='corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--shard-size', type=int, default=10_000)
+    parser.add_argument('--dev-fraction', type=float, default=0.1)
+    parser.add_argument('--templates-per-row', type=int, default=3)
+    parser.add_argument('--shuffle-buffer', type=int, default=10_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    rows = iter_rows(iter_dataset(args.dataset, args.chunksize))
+    if args.mode == 'natural':
+        examples = iter_natural_examples(rows, rng, templates_per_row=args.templates_per_row)
+    else:
+        examples = iter_structured_examples(rows)
+    if args.shuffle_buffer > 1:
+        examples = shuffled(examples, rng, args.shuffle_buffer)
+    stats = write_docbin_shards(examples, args.output, rng,
+                                shard_size=args.shard_size, dev_fraction=args.dev_fraction)
+
+    print(f"Generated {stats['train']} train and {stats['dev']} dev {args.mode} examples "
+          f"in {stats['shards']} shards under {args.output} ({stats['seconds']:.1f}s).")
+    if stats['skipped_entities']:
+        print(f"Skipped {stats['skipped_entities']} entities not aligned to token boundaries.")
+    return stats
+
+
+if __name__ == '__main__':
+    main()